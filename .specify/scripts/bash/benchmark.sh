@@ -0,0 +1,540 @@
+#!/usr/bin/env bash
+
+# Benchmark the .specify scripts against synthetic large-repository fixtures
+#
+# For every scale point this script generates a throwaway git repository with:
+#   - N feature directories under specs/ (spec.md, plan.md, tasks.md, contracts/)
+#   - M local feature branches (default: N), packed like a long-lived clone
+#   - N * REMOTE_FACTOR branches on a bare local repository acting as "origin"
+#   - a current feature (numbered N+1) with a large plan.md and tasks.md
+#   - K agent rule files with long manual sections
+#
+# Each script is then timed cold (caches and indexes removed, mutated inputs
+# restored) and warm (state left by a previous run), reporting p50/p95 and an
+# approximate subprocess count. Results are written as JSON, one result object
+# per line, so runs can be compared and regressions flagged against a baseline.
+#
+# Usage: ./benchmark.sh [OPTIONS]
+#
+# OPTIONS:
+#   --scales LIST        Comma-separated feature counts (default: 10,100,1000)
+#   --branches M         Local feature branches (default: one per feature)
+#   --remote-factor F    Remote branches per feature (default: 4)
+#   --agents K           Number of agent rule files, at most 13 (default: 8)
+#   --doc-lines L        Lines in the large plan.md, tasks.md and agent files (default: 2000)
+#   --runs R             Timed runs per case and mode (default: 5)
+#   --output FILE        Write results JSON to FILE (default: stdout)
+#   --baseline FILE      Compare against a previous results file
+#   --threshold PCT      Regression threshold for p50 against the baseline (default: 25)
+#   --workdir DIR        Where fixtures are generated (default: a temporary directory)
+#   --keep               Keep generated fixtures
+#   --help, -h           Show help message
+#
+# Exit status is 2 when a regression against the baseline is detected.
+
+set -e
+set -u
+set -o pipefail
+
+#==============================================================================
+# Configuration and Global Variables
+#==============================================================================
+
+SCALES="10,100,1000"
+BRANCH_COUNT=""
+REMOTE_FACTOR=4
+AGENT_COUNT=8
+DOC_LINES=2000
+RUNS=5
+OUTPUT_FILE=""
+BASELINE_FILE=""
+THRESHOLD=25
+WORK_DIR=""
+KEEP=false
+
+# Regressions smaller than this are treated as noise regardless of the ratio
+NOISE_FLOOR_MS=5
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --scales|--branches|--remote-factor|--agents|--doc-lines|--runs|--output|--baseline|--threshold|--workdir)
+            if [[ $# -lt 2 || "$2" == --* ]]; then
+                echo "ERROR: $1 requires a value" >&2
+                exit 1
+            fi
+            case "$1" in
+                --scales) SCALES="$2" ;;
+                --branches) BRANCH_COUNT="$2" ;;
+                --remote-factor) REMOTE_FACTOR="$2" ;;
+                --agents) AGENT_COUNT="$2" ;;
+                --doc-lines) DOC_LINES="$2" ;;
+                --runs) RUNS="$2" ;;
+                --output) OUTPUT_FILE="$2" ;;
+                --baseline) BASELINE_FILE="$2" ;;
+                --threshold) THRESHOLD="$2" ;;
+                --workdir) WORK_DIR="$2" ;;
+            esac
+            shift
+            ;;
+        --keep)
+            KEEP=true
+            ;;
+        --help|-h)
+            sed -n '3,33p' "${BASH_SOURCE[0]}" | sed 's/^# \{0,1\}//'
+            exit 0
+            ;;
+        *)
+            echo "ERROR: Unknown option '$1'. Use --help for usage information." >&2
+            exit 1
+            ;;
+    esac
+    shift
+done
+
+for value in ${BRANCH_COUNT:+"$BRANCH_COUNT"} "$REMOTE_FACTOR" "$AGENT_COUNT" "$DOC_LINES" "$RUNS" "$THRESHOLD"; do
+    if [[ ! "$value" =~ ^[0-9]+$ ]]; then
+        echo "ERROR: Numeric options require non-negative integers (got '$value')" >&2
+        exit 1
+    fi
+done
+if [[ ! "$SCALES" =~ ^[0-9]+(,[0-9]+)*$ ]]; then
+    echo "ERROR: --scales requires a comma-separated list of integers" >&2
+    exit 1
+fi
+if [[ -n "$BASELINE_FILE" && ! -f "$BASELINE_FILE" ]]; then
+    echo "ERROR: Baseline file not found: $BASELINE_FILE" >&2
+    exit 1
+fi
+[[ $RUNS -ge 1 ]] || RUNS=1
+
+SCRIPT_DIR="$(CDPATH="" cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+source "$SCRIPT_DIR/common.sh"
+
+# The .specify directory under test (scripts, templates, memory)
+SPECIFY_SOURCE="$(CDPATH="" cd "$SCRIPT_DIR/../.." && pwd)"
+
+AGENT_FILES=(
+    "CLAUDE.md"
+    "GEMINI.md"
+    "AGENTS.md"
+    "QWEN.md"
+    ".github/agents/copilot-instructions.md"
+    ".cursor/rules/specify-rules.mdc"
+    ".windsurf/rules/specify-rules.md"
+    ".kilocode/rules/specify-rules.md"
+    ".augment/rules/specify-rules.md"
+    ".roo/rules/specify-rules.md"
+    "CODEBUDDY.md"
+    "QODER.md"
+    "SHAI.md"
+)
+
+if [[ $AGENT_COUNT -gt ${#AGENT_FILES[@]} ]]; then
+    echo "ERROR: --agents supports at most ${#AGENT_FILES[@]} distinct agent files (got $AGENT_COUNT)" >&2
+    exit 1
+fi
+
+RESULTS=()
+FIXTURE=""
+# Set per scale to a number no generated feature uses, so prefix lookups stay unambiguous
+FIXTURE_BRANCH=""
+
+log_info() {
+    echo "INFO: $1" >&2
+}
+
+log_error() {
+    echo "ERROR: $1" >&2
+}
+
+cleanup() {
+    local exit_code=$?
+    if [[ -n "$WORK_DIR" && "$KEEP" != true && -n "${CREATED_WORK_DIR:-}" ]]; then
+        rm -rf "$WORK_DIR"
+    fi
+    exit $exit_code
+}
+
+trap cleanup EXIT INT TERM
+
+# Run git in the fixture without user configuration getting in the way
+fixture_git() {
+    git -C "$FIXTURE" -c user.name=benchmark -c user.email=benchmark@example.invalid \
+        -c advice.detachedHead=false "$@"
+}
+
+#==============================================================================
+# Fixture Generation
+#==============================================================================
+
+write_plan() {
+    local file="$1"
+    local lines="$2"
+    local i
+
+    {
+        echo "# Implementation Plan: Benchmark"
+        echo
+        echo "## Technical Context"
+        echo
+        echo "**Language/Version**: Python 3.11"
+        echo "**Primary Dependencies**: FastAPI"
+        echo "**Storage**: PostgreSQL"
+        echo "**Project Type**: web"
+        echo
+        for ((i=1; i<=lines; i++)); do
+            echo "Planning note $i: keep the benchmark plan realistically long."
+        done
+    } > "$file"
+}
+
+write_tasks() {
+    local file="$1"
+    local lines="$2"
+    local i phase=1
+
+    {
+        echo "# Tasks: Benchmark"
+        for ((i=1; i<=lines; i++)); do
+            if (( i % 50 == 1 )); then
+                echo
+                echo "## Phase $phase: Generated"
+                echo
+                phase=$((phase + 1))
+            fi
+            printf -- '- [ ] T%03d [P] [US%d] Implement item %d in src/module_%d.py\n' "$i" "$(( (i % 5) + 1 ))" "$i" "$i"
+        done
+    } > "$file"
+}
+
+write_agent_file() {
+    local file="$1"
+    local lines="$2"
+    local i
+
+    mkdir -p "$(dirname "$file")"
+    {
+        echo "# benchmark Development Guidelines"
+        echo
+        echo "Auto-generated from all feature plans. **Last updated**: 2000-01-01"
+        echo
+        echo "## Active Technologies"
+        echo "- Go 1.22 (000-previous)"
+        echo
+        echo "## Recent Changes"
+        echo "- 000-previous: Added Go 1.22"
+        echo "- 000-older: Added Rust"
+        echo
+        echo "<!-- MANUAL ADDITIONS START -->"
+        for ((i=1; i<=lines; i++)); do
+            echo "Manual guideline $i: project-specific guidance maintained by hand."
+        done
+        echo "<!-- MANUAL ADDITIONS END -->"
+    } > "$file"
+}
+
+generate_fixture() {
+    local features="$1"
+    local branches="${BRANCH_COUNT:-$features}"
+    local remote_branches=$((features * REMOTE_FACTOR))
+    local root="$WORK_DIR/scale-$features"
+    local i num refs head
+
+    rm -rf "$root"
+    mkdir -p "$root"
+    FIXTURE="$root/repo"
+
+    git init -q "$FIXTURE"
+    cp -R "$SPECIFY_SOURCE" "$FIXTURE/.specify"
+    fixture_git add .specify
+    fixture_git commit -q -m "Benchmark fixture"
+    head=$(fixture_git rev-parse HEAD)
+
+    # specs/: one directory per feature with the usual documents
+    for ((i=1; i<=features; i++)); do
+        printf -v num '%03d' "$i"
+        mkdir -p "$FIXTURE/specs/$num-feature-$i/contracts"
+        echo "# Feature $i" > "$FIXTURE/specs/$num-feature-$i/spec.md"
+        echo "**Language/Version**: Python 3.11" > "$FIXTURE/specs/$num-feature-$i/plan.md"
+        echo "- [ ] T001 Task" > "$FIXTURE/specs/$num-feature-$i/tasks.md"
+        echo "openapi: 3.0.0" > "$FIXTURE/specs/$num-feature-$i/contracts/api.yaml"
+    done
+
+    # The current feature gets large documents
+    printf -v FIXTURE_BRANCH '%03d-benchmark-feature' $((features + 1))
+    mkdir -p "$FIXTURE/specs/$FIXTURE_BRANCH"
+    write_plan "$FIXTURE/specs/$FIXTURE_BRANCH/plan.md" "$DOC_LINES"
+    write_tasks "$FIXTURE/specs/$FIXTURE_BRANCH/tasks.md" "$DOC_LINES"
+    cp "$FIXTURE/specs/$FIXTURE_BRANCH/plan.md" "$root/plan.md.orig"
+
+    # Local branches, packed like a long-lived clone
+    refs=""
+    for ((i=1; i<=branches; i++)); do
+        printf -v num '%03d' "$i"
+        refs+="create refs/heads/$num-feature-$i $head"$'\n'
+    done
+    printf '%s' "$refs" | fixture_git update-ref --stdin
+    fixture_git checkout -q -b "$FIXTURE_BRANCH"
+
+    # A bare repository stands in for the remote
+    git init -q --bare "$root/remote.git"
+    fixture_git push -q "$root/remote.git" HEAD:refs/heads/main
+    refs=""
+    for ((i=1; i<=remote_branches; i++)); do
+        printf -v num '%03d' "$(( (i % 999) + 1 ))"
+        refs+="create refs/heads/$num-remote-$i $head"$'\n'
+    done
+    printf '%s' "$refs" | git --git-dir="$root/remote.git" update-ref --stdin
+    fixture_git remote add origin "$root/remote.git"
+    fixture_git fetch -q origin
+    fixture_git pack-refs --all
+
+    # Agent rule files
+    mkdir -p "$root/agents.orig"
+    for ((i=0; i<AGENT_COUNT; i++)); do
+        write_agent_file "$FIXTURE/${AGENT_FILES[i]}" "$DOC_LINES"
+        mkdir -p "$root/agents.orig/$(dirname "${AGENT_FILES[i]}")"
+        cp "$FIXTURE/${AGENT_FILES[i]}" "$root/agents.orig/${AGENT_FILES[i]}"
+    done
+
+    # Remember the generated branches and features so runs that create new
+    # ones (create-new-feature) can be undone
+    fixture_git for-each-ref --format='%(refname)' refs/heads > "$root/refs.orig"
+    ls "$FIXTURE/specs" > "$root/specs.orig"
+}
+
+#==============================================================================
+# Measurement
+#==============================================================================
+
+# Remove caches and indexes and restore inputs that the scripts mutate
+reset_cold_state() {
+    local root="${FIXTURE%/repo}"
+    local i
+
+    rm -rf "$FIXTURE/.git/specify"
+    for ((i=0; i<AGENT_COUNT; i++)); do
+        cp "$root/agents.orig/${AGENT_FILES[i]}" "$FIXTURE/${AGENT_FILES[i]}"
+    done
+    restore_fixture_branch
+}
+
+# Put the fixture back on the benchmark feature with its large plan, without any
+# branches or feature directories added since it was generated
+restore_fixture_branch() {
+    local root="${FIXTURE%/repo}"
+    if [[ "$(fixture_git rev-parse --abbrev-ref HEAD)" != "$FIXTURE_BRANCH" ]]; then
+        fixture_git checkout -q "$FIXTURE_BRANCH"
+    fi
+    cp "$root/plan.md.orig" "$FIXTURE/specs/$FIXTURE_BRANCH/plan.md"
+
+    local -A known=()
+    local entry
+    while IFS= read -r entry; do
+        known["$entry"]=1
+    done < "$root/refs.orig"
+    while IFS= read -r entry; do
+        [[ -n "${known[$entry]:-}" ]] || fixture_git update-ref -d "$entry"
+    done < <(fixture_git for-each-ref --format='%(refname)' refs/heads)
+
+    known=()
+    while IFS= read -r entry; do
+        known["$entry"]=1
+    done < "$root/specs.orig"
+    for entry in "$FIXTURE"/specs/*/; do
+        entry="${entry%/}"
+        [[ -n "${known[${entry##*/}]:-}" ]] || rm -rf "$entry"
+    done
+}
+
+# Approximate number of processes a command spawns. Uses strace when available,
+# otherwise the system-wide PID counter on Linux (noisy on busy machines).
+count_processes() {
+    if command -v strace >/dev/null 2>&1; then
+        local trace_file="$WORK_DIR/strace.out"
+        (cd "$FIXTURE" && strace -f -qq -o "$trace_file" -e trace=fork,vfork,clone,clone3 "$@" >/dev/null 2>&1) || true
+        local forks
+        forks=$(grep -cE '(clone|clone3|fork|vfork)\(' "$trace_file" 2>/dev/null) || true
+        rm -f "$trace_file"
+        echo "${forks:-0}"
+    elif [[ -r /proc/loadavg ]]; then
+        local before after
+        before=$(< /proc/loadavg)
+        (cd "$FIXTURE" && "$@" >/dev/null 2>&1) || true
+        after=$(< /proc/loadavg)
+        # The subshell and the $(< ...) expansion account for two of the PIDs
+        echo $(( ${after##* } - ${before##* } - 2 ))
+    else
+        echo "null"
+    fi
+}
+
+# Print the p-th percentile (nearest rank) of the given sorted values
+percentile() {
+    local p="$1"
+    shift
+    local values=("$@")
+    local rank=$(( (p * ${#values[@]} + 99) / 100 ))
+    [[ $rank -lt 1 ]] && rank=1
+    echo "${values[rank-1]}"
+}
+
+# Time one script in one mode and record a result line
+bench_case() {
+    local scale="$1"
+    local name="$2"
+    local mode="$3"
+    shift 3
+    local timings=()
+    local run started finished
+
+    if [[ "$mode" == "warm" ]]; then
+        # Populate caches and indexes once before measuring
+        (cd "$FIXTURE" && "$@" >/dev/null 2>&1) || true
+        restore_fixture_branch
+    fi
+
+    for ((run=0; run<RUNS; run++)); do
+        if [[ "$mode" == "cold" ]]; then
+            reset_cold_state
+        else
+            restore_fixture_branch
+        fi
+        started=$(get_epoch_ms)
+        (cd "$FIXTURE" && "$@" >/dev/null 2>&1) || true
+        finished=$(get_epoch_ms)
+        timings+=($((finished - started)))
+    done
+
+    [[ "$mode" == "cold" ]] && reset_cold_state || restore_fixture_branch
+    local processes
+    processes=$(count_processes "$@")
+    restore_fixture_branch
+
+    local sorted=()
+    mapfile -t sorted < <(printf '%s\n' "${timings[@]}" | sort -n)
+    local p50 p95
+    p50=$(percentile 50 "${sorted[@]}")
+    p95=$(percentile 95 "${sorted[@]}")
+
+    log_info "scale=$scale $name ($mode): p50=${p50}ms p95=${p95}ms processes=$processes"
+    RESULTS+=("$(printf '{"scale":%d,"script":"%s","mode":"%s","runs":%d,"p50_ms":%d,"p95_ms":%d,"min_ms":%d,"max_ms":%d,"processes":%s}' \
+        "$scale" "$name" "$mode" "$RUNS" "$p50" "$p95" "${sorted[0]}" "${sorted[${#sorted[@]}-1]}" "$processes")")
+}
+
+bench_scale() {
+    local scale="$1"
+    local scripts=".specify/scripts/bash"
+    local mode
+
+    log_info "Generating fixture: $scale features, ${BRANCH_COUNT:-$scale} local branches, $((scale * REMOTE_FACTOR)) remote branches, $AGENT_COUNT agent files"
+    generate_fixture "$scale"
+
+    for mode in cold warm; do
+        bench_case "$scale" "check-prerequisites --paths-only" "$mode" bash "$scripts/check-prerequisites.sh" --json --paths-only
+        bench_case "$scale" "check-prerequisites --all" "$mode" bash "$scripts/check-prerequisites.sh" --all
+        bench_case "$scale" "update-agent-context" "$mode" bash "$scripts/update-agent-context.sh"
+        bench_case "$scale" "setup-plan" "$mode" bash "$scripts/setup-plan.sh" --json
+        bench_case "$scale" "create-new-feature" "$mode" bash "$scripts/create-new-feature.sh" --json "Benchmark run feature"
+    done
+
+    if [[ "$KEEP" != true ]]; then
+        rm -rf "${FIXTURE%/repo}"
+    fi
+}
+
+#==============================================================================
+# Reporting
+#==============================================================================
+
+# Flag results whose p50 regressed beyond the threshold. Prints one line per
+# regression and returns 1 if any were found.
+compare_with_baseline() {
+    local -A baseline=()
+    local line key p50 current regressions=0
+
+    while IFS= read -r line; do
+        [[ "$line" =~ \"scale\":([0-9]+),\"script\":\"([^\"]+)\",\"mode\":\"([a-z]+)\".*\"p50_ms\":([0-9]+) ]] || continue
+        baseline["${BASH_REMATCH[1]}|${BASH_REMATCH[2]}|${BASH_REMATCH[3]}"]="${BASH_REMATCH[4]}"
+    done < "$BASELINE_FILE"
+
+    for line in "${RESULTS[@]}"; do
+        [[ "$line" =~ \"scale\":([0-9]+),\"script\":\"([^\"]+)\",\"mode\":\"([a-z]+)\".*\"p50_ms\":([0-9]+) ]] || continue
+        key="${BASH_REMATCH[1]}|${BASH_REMATCH[2]}|${BASH_REMATCH[3]}"
+        current="${BASH_REMATCH[4]}"
+        p50="${baseline[$key]:-}"
+        [[ -n "$p50" ]] || continue
+
+        if (( current - p50 > NOISE_FLOOR_MS && current * 100 > p50 * (100 + THRESHOLD) )); then
+            log_error "Regression: ${key//|/ } p50 ${p50}ms -> ${current}ms"
+            regressions=$((regressions + 1))
+        fi
+    done
+
+    [[ $regressions -eq 0 ]]
+}
+
+write_results() {
+    local timestamp
+    timestamp=$(date -u +%Y-%m-%dT%H:%M:%SZ)
+    local i
+
+    {
+        echo "{"
+        printf '"timestamp":"%s",\n' "$timestamp"
+        printf '"host":"%s",\n' "$(uname -sm)"
+        printf '"bash":"%s",\n' "$BASH_VERSION"
+        printf '"params":{"scales":"%s","branches":%s,"remote_factor":%d,"agents":%d,"doc_lines":%d,"runs":%d},\n' \
+            "$SCALES" "${BRANCH_COUNT:-null}" "$REMOTE_FACTOR" "$AGENT_COUNT" "$DOC_LINES" "$RUNS"
+        echo '"results":['
+        for i in "${!RESULTS[@]}"; do
+            if [[ $i -lt $((${#RESULTS[@]} - 1)) ]]; then
+                echo "${RESULTS[i]},"
+            else
+                echo "${RESULTS[i]}"
+            fi
+        done
+        echo "]"
+        echo "}"
+    }
+}
+
+#==============================================================================
+# Main Execution
+#==============================================================================
+
+main() {
+    if [[ -z "$WORK_DIR" ]]; then
+        WORK_DIR=$(mktemp -d)
+        CREATED_WORK_DIR=true
+    fi
+    mkdir -p "$WORK_DIR"
+    WORK_DIR="$(CDPATH="" cd "$WORK_DIR" && pwd)"
+
+    local scale
+    local scales=()
+    IFS=',' read -r -a scales <<< "$SCALES"
+    for scale in "${scales[@]}"; do
+        bench_scale "$scale"
+    done
+
+    if [[ -n "$OUTPUT_FILE" ]]; then
+        write_results > "$OUTPUT_FILE"
+        log_info "Results written to $OUTPUT_FILE"
+    else
+        write_results
+    fi
+
+    if [[ -n "$BASELINE_FILE" ]]; then
+        if ! compare_with_baseline; then
+            exit 2
+        fi
+        log_info "No regressions against $BASELINE_FILE (threshold ${THRESHOLD}%)"
+    fi
+
+    if [[ "$KEEP" == true ]]; then
+        log_info "Fixtures kept in $WORK_DIR"
+    fi
+}
+
+main
@@ -12,10 +12,15 @@
 #   --require-tasks     Require tasks.md to exist (for implementation phase)
 #   --include-tasks     Include tasks.md in AVAILABLE_DOCS list
 #   --paths-only        Only output path variables (no validation)
+#   --no-cache          Resolve paths from git instead of the cached context
+#   --all               Check every specs/NNN-* directory instead of the current feature
+#   --jobs N            Worker processes used by --all (default: CPU count)
 #   --help, -h          Show help message
 #
 # OUTPUTS:
 #   JSON mode: {"FEATURE_DIR":"...", "AVAILABLE_DOCS":["..."]}
+#   All mode:  one JSON line per feature with FEATURE_DIR, AVAILABLE_DOCS, HAS_SPEC,
+#              HAS_PLAN, HAS_TASKS and VALID; exits 1 if any feature is not valid
 #   Text mode: FEATURE_DIR:... \n AVAILABLE_DOCS: \n ✓/✗ file.md
 #   Paths only: REPO_ROOT: ... \n BRANCH: ... \n FEATURE_DIR: ... etc.
 
@@ -26,8 +31,21 @@ JSON_MODE=false
 REQUIRE_TASKS=false
 INCLUDE_TASKS=false
 PATHS_ONLY=false
+ALL_MODE=false
+JOBS=""
+EXPECT_JOBS=false
 
 for arg in "$@"; do
+    if $EXPECT_JOBS; then
+        if [[ ! "$arg" =~ ^[1-9][0-9]*$ ]]; then
+            echo "ERROR: --jobs requires a positive integer" >&2
+            exit 1
+        fi
+        JOBS="$arg"
+        EXPECT_JOBS=false
+        continue
+    fi
+
     case "$arg" in
         --json)
             JSON_MODE=true
@@ -41,6 +59,15 @@ for arg in "$@"; do
         --paths-only)
             PATHS_ONLY=true
             ;;
+        --no-cache)
+            export SPECIFY_NO_CACHE=1
+            ;;
+        --all)
+            ALL_MODE=true
+            ;;
+        --jobs)
+            EXPECT_JOBS=true
+            ;;
         --help|-h)
             cat << 'EOF'
 Usage: check-prerequisites.sh [OPTIONS]
@@ -52,6 +79,9 @@ OPTIONS:
   --require-tasks     Require tasks.md to exist (for implementation phase)
   --include-tasks     Include tasks.md in AVAILABLE_DOCS list
   --paths-only        Only output path variables (no prerequisite validation)
+  --no-cache          Resolve paths from git instead of the cached context
+  --all               Check every specs/NNN-* directory and print one JSON line each
+  --jobs N            Worker processes used by --all (default: CPU count)
   --help, -h          Show this help message
 
 EXAMPLES:
@@ -64,6 +94,9 @@ EXAMPLES:
   # Get feature paths only (no validation)
   ./check-prerequisites.sh --paths-only
   
+  # Check every feature in the workspace (release gate)
+  ./check-prerequisites.sh --all --require-tasks
+  
 EOF
             exit 0
             ;;
@@ -74,12 +107,181 @@ EOF
     esac
 done
 
+if $EXPECT_JOBS; then
+    echo "ERROR: --jobs requires a positive integer" >&2
+    exit 1
+fi
+
 # Source common functions
 SCRIPT_DIR="$(CDPATH="" cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 source "$SCRIPT_DIR/common.sh"
 
+# Set FEATURE_DOC_FLAGS to the document status of a feature directory as 0/1
+# flags in the order: spec plan tasks research data-model contracts quickstart
+feature_doc_flags() {
+    local dir="$1"
+    local flags=""
+    local doc
+
+    for doc in spec.md plan.md tasks.md research.md data-model.md; do
+        [[ -f "$dir/$doc" ]] && flags+="1" || flags+="0"
+    done
+
+    local contracts=("$dir"/contracts/*)
+    [[ ${#contracts[@]} -gt 0 ]] && flags+="1" || flags+="0"
+
+    [[ -f "$dir/quickstart.md" ]] && flags+="1" || flags+="0"
+    FEATURE_DOC_FLAGS="$flags"
+}
+
+# Render one --all record from a feature directory and its document flags
+print_feature_record() {
+    local dir="$1"
+    local flags="$2"
+    local docs=()
+    local valid=true
+
+    [[ "${flags:3:1}" == 1 ]] && docs+=("research.md")
+    [[ "${flags:4:1}" == 1 ]] && docs+=("data-model.md")
+    [[ "${flags:5:1}" == 1 ]] && docs+=("contracts/")
+    [[ "${flags:6:1}" == 1 ]] && docs+=("quickstart.md")
+    $INCLUDE_TASKS && [[ "${flags:2:1}" == 1 ]] && docs+=("tasks.md")
+
+    [[ "${flags:1:1}" == 1 ]] || valid=false
+    $REQUIRE_TASKS && [[ "${flags:2:1}" != 1 ]] && valid=false
+
+    local json_docs="" doc
+    for doc in "${docs[@]}"; do
+        json_docs+="\"$doc\","
+    done
+    json_docs="[${json_docs%,}]"
+
+    local has_spec=false has_plan=false has_tasks=false
+    [[ "${flags:0:1}" == 1 ]] && has_spec=true
+    [[ "${flags:1:1}" == 1 ]] && has_plan=true
+    [[ "${flags:2:1}" == 1 ]] && has_tasks=true
+
+    printf '{"FEATURE_DIR":"%s","AVAILABLE_DOCS":%s,"HAS_SPEC":%s,"HAS_PLAN":%s,"HAS_TASKS":%s,"VALID":%s}\n' \
+        "$dir" "$json_docs" "$has_spec" "$has_plan" "$has_tasks" "$valid"
+}
+
+# Check every feature directory with a bounded worker pool. Document flags are
+# cached per directory, keyed on the mtimes of the directory and its contracts/
+# subdirectory, so a warm re-scan only inspects directories that changed.
+check_all_features() {
+    shopt -s nullglob dotglob
+
+    local specs_dir="$REPO_ROOT/specs"
+    local dirs=("$specs_dir"/[0-9][0-9][0-9]-*/)
+    dirs=("${dirs[@]%/}")
+    [[ ${#dirs[@]} -eq 0 ]] && return 0
+
+    local jobs="${JOBS:-$(trace_cmd getconf _NPROCESSORS_ONLN 2>/dev/null || echo 4)}"
+
+    local cache_file=""
+    if [[ "${SPECIFY_NO_CACHE:-}" != "1" ]] && locate_git_dir; then
+        cache_file="$SPECIFY_GIT_DIR/specify/prerequisites"
+    fi
+
+    # Collect directory and contracts/ mtimes with a single stat call
+    trace_begin phase stat-features
+    local -A mtimes=()
+    local mtime path dir
+    local stat_paths=("${dirs[@]}")
+    for dir in "${dirs[@]}"; do
+        stat_paths+=("$dir/contracts")
+    done
+    while read -r mtime path; do
+        mtimes["$path"]="$mtime"
+    done < <(stat_mtimes "${stat_paths[@]}")
+    trace_end
+
+    local -A cached_keys=() cached_flags=()
+    local key flags
+    if [[ -n "$cache_file" && -f "$cache_file" ]]; then
+        while IFS=$'\t' read -r dir key flags; do
+            cached_keys["$dir"]="$key"
+            cached_flags["$dir"]="$flags"
+        done < "$cache_file"
+    fi
+
+    # Entries touched within the current second are not cached, since a later
+    # change in the same second would not alter their mtime
+    local now
+    printf -v now '%(%s)T' -1
+
+    trace_begin phase cached-features
+    local misses=() cache_lines=() failed=false
+    for dir in "${dirs[@]}"; do
+        key="${mtimes[$dir]:-0}:${mtimes[$dir/contracts]:-0}"
+        if [[ "${cached_keys[$dir]:-}" == "$key" ]]; then
+            print_feature_record "$dir" "${cached_flags[$dir]}"
+            [[ "${cached_flags[$dir]:1:1}" == 1 ]] || failed=true
+            $REQUIRE_TASKS && [[ "${cached_flags[$dir]:2:1}" != 1 ]] && failed=true
+            cache_lines+=("$dir"$'\t'"$key"$'\t'"${cached_flags[$dir]}")
+        else
+            misses+=("$dir")
+        fi
+    done
+    trace_end
+
+    local work_dir=""
+    if [[ ${#misses[@]} -gt 0 ]]; then
+        trace_begin phase scan-features
+        work_dir=$(trace_cmd mktemp -d)
+        [[ $jobs -gt ${#misses[@]} ]] && jobs=${#misses[@]}
+
+        local worker i
+        for ((worker=0; worker<jobs; worker++)); do
+            (
+                for ((i=worker; i<${#misses[@]}; i+=jobs)); do
+                    dir="${misses[i]}"
+                    feature_doc_flags "$dir"
+                    flags="$FEATURE_DOC_FLAGS"
+                    print_feature_record "$dir" "$flags"
+                    key="${mtimes[$dir]:-0}:${mtimes[$dir/contracts]:-0}"
+                    printf '%s\t%s\t%s\n' "$dir" "$key" "$flags" >> "$work_dir/$worker"
+                done
+            ) &
+        done
+        trace_begin func wait-workers
+        wait
+        trace_end 0 "$jobs"
+
+        for ((worker=0; worker<jobs; worker++)); do
+            [[ -f "$work_dir/$worker" ]] || continue
+            while IFS=$'\t' read -r dir key flags; do
+                [[ "${flags:1:1}" == 1 ]] || failed=true
+                $REQUIRE_TASKS && [[ "${flags:2:1}" != 1 ]] && failed=true
+                [[ "${mtimes[$dir]:-$now}" -lt "$now" && "${mtimes[$dir/contracts]:-0}" -lt "$now" ]] || continue
+                cache_lines+=("$dir"$'\t'"$key"$'\t'"$flags")
+            done < "$work_dir/$worker"
+        done
+        trace_cmd rm -rf "$work_dir"
+        trace_end
+    fi
+
+    # Best effort: a read-only git directory simply means no caching
+    if [[ -n "$cache_file" && ${#misses[@]} -gt 0 ]]; then
+        {
+            trace_cmd mkdir -p "${cache_file%/*}" &&
+                printf '%s\n' "${cache_lines[@]}" > "$cache_file.$$" &&
+                trace_cmd mv -f "$cache_file.$$" "$cache_file"
+        } 2>/dev/null || rm -f "$cache_file.$$" 2>/dev/null || true
+    fi
+
+    ! $failed
+}
+
 # Get feature paths and validate branch
 eval $(get_feature_paths)
+
+# Workspace-wide mode checks every feature regardless of the current branch
+if $ALL_MODE; then
+    check_all_features
+    exit $?
+fi
+
 check_feature_branch "$CURRENT_BRANCH" "$HAS_GIT" || exit 1
 
 # If paths-only mode, output paths and exit (support JSON + paths-only combined)
@@ -127,7 +329,7 @@ docs=()
 [[ -f "$DATA_MODEL" ]] && docs+=("data-model.md")
 
 # Check contracts directory (only if it exists and has files)
-if [[ -d "$CONTRACTS_DIR" ]] && [[ -n "$(ls -A "$CONTRACTS_DIR" 2>/dev/null)" ]]; then
+if [[ -d "$CONTRACTS_DIR" ]] && [[ -n "$(trace_cmd ls -A "$CONTRACTS_DIR" 2>/dev/null)" ]]; then
     docs+=("contracts/")
 fi
 
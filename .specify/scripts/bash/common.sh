@@ -3,8 +3,8 @@
 
 # Get repository root, with fallback for non-git repositories
 get_repo_root() {
-    if git rev-parse --show-toplevel >/dev/null 2>&1; then
-        git rev-parse --show-toplevel
+    if trace_cmd git rev-parse --show-toplevel >/dev/null 2>&1; then
+        trace_cmd git rev-parse --show-toplevel
     else
         # Fall back to script location for non-git repos
         local script_dir="$(CDPATH="" cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
@@ -21,8 +21,8 @@ get_current_branch() {
     fi
 
     # Then check git if available
-    if git rev-parse --abbrev-ref HEAD >/dev/null 2>&1; then
-        git rev-parse --abbrev-ref HEAD
+    if trace_cmd git rev-parse --abbrev-ref HEAD >/dev/null 2>&1; then
+        trace_cmd git rev-parse --abbrev-ref HEAD
         return
     fi
 
@@ -59,7 +59,7 @@ get_current_branch() {
 
 # Check if we have git available
 has_git() {
-    git rev-parse --show-toplevel >/dev/null 2>&1
+    trace_cmd git rev-parse --show-toplevel >/dev/null 2>&1
 }
 
 check_feature_branch() {
@@ -124,9 +124,38 @@ find_feature_dir_by_prefix() {
     fi
 }
 
-get_feature_paths() {
-    local repo_root=$(get_repo_root)
-    local current_branch=$(get_current_branch)
+# Locate the repository root and git directory by walking up from $PWD, without
+# spawning git. Sets SPECIFY_GIT_ROOT and SPECIFY_GIT_DIR; returns 1 if not found.
+locate_git_dir() {
+    local dir
+    dir=$(pwd -P)
+
+    while [[ -n "$dir" ]]; do
+        if [[ -d "$dir/.git" ]]; then
+            SPECIFY_GIT_ROOT="$dir"
+            SPECIFY_GIT_DIR="$dir/.git"
+            return 0
+        elif [[ -f "$dir/.git" ]]; then
+            # Worktrees and submodules use a "gitdir: <path>" pointer file
+            local pointer
+            IFS= read -r pointer < "$dir/.git" || true
+            pointer="${pointer#gitdir: }"
+            [[ "$pointer" == /* ]] || pointer="$dir/$pointer"
+            SPECIFY_GIT_ROOT="$dir"
+            SPECIFY_GIT_DIR="$pointer"
+            return 0
+        fi
+        dir="${dir%/*}"
+    done
+
+    return 1
+}
+
+# Resolve feature paths without any cache
+resolve_feature_paths() {
+    trace_begin func resolve_feature_paths
+    local repo_root=$(trace_call get_repo_root)
+    local current_branch=$(trace_call get_current_branch)
     local has_git_repo="false"
 
     if has_git; then
@@ -134,7 +163,8 @@ get_feature_paths() {
     fi
 
     # Use prefix-based lookup to support multiple branches per spec
-    local feature_dir=$(find_feature_dir_by_prefix "$repo_root" "$current_branch")
+    local feature_dir=$(trace_call find_feature_dir_by_prefix "$repo_root" "$current_branch")
+    trace_end
 
     cat <<EOF
 REPO_ROOT='$repo_root'
@@ -151,6 +181,203 @@ CONTRACTS_DIR='$feature_dir/contracts'
 EOF
 }
 
+# Resolve feature paths, reusing a cached result stored in the git directory.
+# The cache is keyed on the contents of HEAD, SPECIFY_FEATURE and the repository
+# root, and is discarded whenever specs/ is newer than it, so a warm call spawns
+# no processes at all. Set SPECIFY_NO_CACHE=1 (or pass --no-cache) to bypass it.
+get_feature_paths() {
+    local no_cache="${SPECIFY_NO_CACHE:-}"
+    if [[ "$no_cache" == "1" || "$no_cache" == "true" || -n "${GIT_DIR:-}${GIT_WORK_TREE:-}" ]] || ! locate_git_dir; then
+        trace_begin phase feature-paths
+        resolve_feature_paths
+        trace_end
+        return
+    fi
+
+    trace_begin phase feature-paths
+
+    local cache_file="$SPECIFY_GIT_DIR/specify/context"
+    local specs_dir="$SPECIFY_GIT_ROOT/specs"
+    local head=""
+    IFS= read -r head < "$SPECIFY_GIT_DIR/HEAD" 2>/dev/null || true
+
+    local specs_state="absent"
+    [[ -d "$specs_dir" ]] && specs_state="present"
+    local key="$head|${SPECIFY_FEATURE:-}|$SPECIFY_GIT_ROOT|$specs_state"
+
+    if [[ -f "$cache_file" ]] && ! [[ "$specs_dir" -nt "$cache_file" ]]; then
+        local cached=""
+        IFS= read -r -d '' cached < "$cache_file" || true
+        if [[ "${cached%%$'\n'*}" == "$key" ]]; then
+            printf '%s' "${cached#*$'\n'}"
+            trace_end
+            return
+        fi
+    fi
+
+    local paths
+    paths=$(resolve_feature_paths)
+    printf '%s\n' "$paths"
+
+    # Best effort: a read-only git directory simply means no caching
+    {
+        trace_cmd mkdir -p "${cache_file%/*}" &&
+            printf '%s\n%s\n' "$key" "$paths" > "$cache_file.$$" &&
+            trace_cmd mv -f "$cache_file.$$" "$cache_file"
+    } 2>/dev/null || rm -f "$cache_file.$$" 2>/dev/null || true
+    trace_end
+}
+
+# Milliseconds since the epoch (falls back to second resolution without EPOCHREALTIME)
+get_epoch_ms() {
+    if [[ -n "${EPOCHREALTIME:-}" ]]; then
+        local now="${EPOCHREALTIME/[.,]/}"
+        echo $(( 10#$now / 1000 ))
+    else
+        echo $(( $(date +%s) * 1000 ))
+    fi
+}
+
+# Print "<mtime> <path>" for every existing path using a single stat call
+stat_mtimes() {
+    [[ $# -eq 0 ]] && return 0
+    if trace_cmd stat -c '%Y' / >/dev/null 2>&1; then
+        trace_cmd stat -c '%Y %n' -- "$@" 2>/dev/null || true
+    else
+        trace_cmd stat -f '%m %N' -- "$@" 2>/dev/null || true
+    fi
+}
+
 check_file() { [[ -f "$1" ]] && echo "  ✓ $2" || echo "  ✗ $2"; }
-check_dir() { [[ -d "$1" && -n $(ls -A "$1" 2>/dev/null) ]] && echo "  ✓ $2" || echo "  ✗ $2"; }
+check_dir() { [[ -d "$1" && -n $(trace_cmd ls -A "$1" 2>/dev/null) ]] && echo "  ✓ $2" || echo "  ✗ $2"; }
+
+
+# Opt-in tracing. Set SPECIFY_TRACE to a file path (or to 1 for
+# ${TMPDIR:-/tmp}/specify-trace.jsonl) and every script appends one JSON line per
+# completed span: phases and functions (trace_begin/trace_end, trace_call) and
+# external commands (trace_cmd). Spans record their parent, enclosing phase,
+# duration in microseconds, exit status and the number of processes they forked.
+# Scripts started by a traced script share its run id. When tracing is off the
+# helpers are pass-throughs that spawn nothing.
+case "${SPECIFY_TRACE:-}" in
+    ""|0|false) SPECIFY_TRACE_FILE="" ;;
+    1|true) SPECIFY_TRACE_FILE="${TMPDIR:-/tmp}/specify-trace.jsonl" ;;
+    /*) SPECIFY_TRACE_FILE="$SPECIFY_TRACE" ;;
+    *) SPECIFY_TRACE_FILE="$PWD/$SPECIFY_TRACE" ;;
+esac
+
+if [[ -z "$SPECIFY_TRACE_FILE" ]]; then
+    trace_begin() { :; }
+    trace_end() { :; }
+    trace_call() { "$@"; }
+    trace_cmd() { "$@"; }
+else
+    export SPECIFY_TRACE="$SPECIFY_TRACE_FILE"
+    export SPECIFY_TRACE_RUN="${SPECIFY_TRACE_RUN:-$$.${EPOCHSECONDS:-$SECONDS}}"
+    _TRACE_SCRIPT="${0##*/}"
+    _TRACE_SEQ=0
+    _TRACE_PID=$BASHPID
+    _TRACE_IDS=()
+    _TRACE_KINDS=()
+    _TRACE_NAMES=()
+    _TRACE_PHASES=()
+    _TRACE_STARTS=()
+    _TRACE_FORKS=()
+
+    _trace_now() {
+        if [[ -n "${EPOCHREALTIME:-}" ]]; then
+            _TRACE_NOW="${EPOCHREALTIME/[.,]/}"
+            _TRACE_NOW=$((10#$_TRACE_NOW))
+        else
+            _TRACE_NOW=$(( $(date +%s) * 1000000 ))
+        fi
+    }
+
+    _trace_escape() {
+        _TRACE_ESCAPED="${1//\\/\\\\}"
+        _TRACE_ESCAPED="${_TRACE_ESCAPED//\"/\\\"}"
+        _TRACE_ESCAPED="${_TRACE_ESCAPED//$'\t'/ }"
+        _TRACE_ESCAPED="${_TRACE_ESCAPED//$'\n'/ }"
+    }
+
+    # trace_begin <phase|func|cmd> <name>. The first function or phase span
+    # opened in a subshell (e.g. inside $(...)) also counts the fork behind it;
+    # a command run from a fresh subshell is exec'd in place, so it does not.
+    trace_begin() {
+        local kind="$1" name="$2" depth=${#_TRACE_IDS[@]} phase="" forks=0
+        [[ $depth -gt 0 ]] && phase="${_TRACE_PHASES[depth-1]}"
+        [[ "$kind" == "phase" ]] && phase="$name"
+        if [[ $BASHPID != "$_TRACE_PID" ]]; then
+            _TRACE_PID=$BASHPID
+            [[ "$kind" != "cmd" ]] && forks=1
+        fi
+
+        _TRACE_SEQ=$((_TRACE_SEQ + 1))
+        _TRACE_IDS+=("$BASHPID.$_TRACE_SEQ")
+        _TRACE_KINDS+=("$kind")
+        _TRACE_NAMES+=("$name")
+        _TRACE_PHASES+=("$phase")
+        _TRACE_FORKS+=("$forks")
+        _trace_now
+        _TRACE_STARTS+=("$_TRACE_NOW")
+    }
+
+    # trace_end [status] [forks] - close the innermost span. Command spans count
+    # one fork unless told otherwise (e.g. a five-stage pipeline passes 5).
+    trace_end() {
+        local status="${1:-0}" top=$(( ${#_TRACE_IDS[@]} - 1 ))
+        [[ $top -ge 0 ]] || return 0
+        _trace_now
+
+        local kind="${_TRACE_KINDS[top]}" parent=""
+        local forks="${2:-}"
+        [[ -z "$forks" ]] && { [[ "$kind" == "cmd" ]] && forks=1 || forks=0; }
+        forks=$((forks + _TRACE_FORKS[top]))
+        [[ $top -gt 0 ]] && parent="${_TRACE_IDS[top-1]}"
+
+        local name phase
+        _trace_escape "${_TRACE_NAMES[top]}"; name="$_TRACE_ESCAPED"
+        _trace_escape "${_TRACE_PHASES[top]}"; phase="$_TRACE_ESCAPED"
+
+        printf '{"run":"%s","script":"%s","pid":%d,"id":"%s","parent":"%s","depth":%d,"kind":"%s","name":"%s","phase":"%s","start_us":%d,"dur_us":%d,"status":%d,"forks":%d}\n' \
+            "$SPECIFY_TRACE_RUN" "$_TRACE_SCRIPT" "$BASHPID" "${_TRACE_IDS[top]}" "$parent" "$top" \
+            "$kind" "$name" "$phase" "${_TRACE_STARTS[top]}" $((_TRACE_NOW - _TRACE_STARTS[top])) \
+            "$status" "$forks" >> "$SPECIFY_TRACE_FILE" 2>/dev/null || true
+
+        unset '_TRACE_IDS[top]' '_TRACE_KINDS[top]' '_TRACE_NAMES[top]' '_TRACE_PHASES[top]' '_TRACE_STARTS[top]' '_TRACE_FORKS[top]'
+        return 0
+    }
+
+    # trace_call <function> [args...] - run a shell function inside a span. Its
+    # own errexit behaviour is untouched, so a failure that aborts the script
+    # leaves the span unrecorded.
+    trace_call() {
+        trace_begin func "$1"
+        "$@"
+        local status=$?
+        trace_end "$status"
+        return "$status"
+    }
+
+    # trace_cmd <command> [args...] - run one external command inside a span,
+    # named after the command (and the subcommand, for git)
+    trace_cmd() {
+        local name="$1" arg skip=false
+        if [[ "$1" == "git" ]]; then
+            for arg in "${@:2}"; do
+                if $skip; then skip=false; continue; fi
+                case "$arg" in
+                    -C|-c) skip=true ;;
+                    -*) ;;
+                    *) name="git $arg"; break ;;
+                esac
+            done
+        fi
 
+        trace_begin cmd "$name"
+        local status=0
+        "$@" || status=$?
+        trace_end "$status"
+        return "$status"
+    }
+fi
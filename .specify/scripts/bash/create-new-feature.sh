@@ -3,6 +3,9 @@
 set -e
 
 JSON_MODE=false
+BATCH_MODE=false
+OFFLINE_MODE="${SPECIFY_OFFLINE:-false}"
+[ "$OFFLINE_MODE" = "1" ] && OFFLINE_MODE=true
 SHORT_NAME=""
 BRANCH_NUMBER=""
 ARGS=()
@@ -13,6 +16,12 @@ while [ $i -le $# ]; do
         --json) 
             JSON_MODE=true 
             ;;
+        --offline)
+            OFFLINE_MODE=true
+            ;;
+        --batch)
+            BATCH_MODE=true
+            ;;
         --short-name)
             if [ $((i + 1)) -gt $# ]; then
                 echo 'Error: --short-name requires a value' >&2
@@ -41,17 +50,26 @@ while [ $i -le $# ]; do
             BRANCH_NUMBER="$next_arg"
             ;;
         --help|-h) 
-            echo "Usage: $0 [--json] [--short-name <name>] [--number N] <feature_description>"
+            echo "Usage: $0 [--json] [--offline] [--short-name <name>] [--number N] <feature_description>"
+            echo "       $0 --batch [--offline] < features.jsonl"
             echo ""
             echo "Options:"
             echo "  --json              Output in JSON format"
+            echo "  --offline           Skip 'git fetch' and allocate from local refs only (or SPECIFY_OFFLINE=1)"
             echo "  --short-name <name> Provide a custom short name (2-4 words) for the branch"
             echo "  --number N          Specify branch number manually (overrides auto-detection)"
+            echo "  --batch             Read one JSON object per line from stdin:"
+            echo "                      {\"description\": \"...\", \"short_name\": \"...\", \"number\": N}"
+            echo "                      Branches are created without being checked out and one JSON"
+            echo "                      result line is printed per feature; exits 1 if any line failed."
+            echo "                      Only \\\", \\\\, \\/, \\n and \\t escapes are decoded; write other"
+            echo "                      characters as literal UTF-8 (\\uXXXX escapes are rejected)"
             echo "  --help, -h          Show this help message"
             echo ""
             echo "Examples:"
             echo "  $0 'Add user authentication system' --short-name 'user-auth'"
             echo "  $0 'Implement OAuth2 integration for API' --number 5"
+            echo "  echo '{\"description\": \"Add user auth\"}' | $0 --batch"
             exit 0
             ;;
         *) 
@@ -62,8 +80,8 @@ while [ $i -le $# ]; do
 done
 
 FEATURE_DESCRIPTION="${ARGS[*]}"
-if [ -z "$FEATURE_DESCRIPTION" ]; then
-    echo "Usage: $0 [--json] [--short-name <name>] [--number N] <feature_description>" >&2
+if [ -z "$FEATURE_DESCRIPTION" ] && ! $BATCH_MODE; then
+    echo "Usage: $0 [--json] [--offline] [--short-name <name>] [--number N] <feature_description>" >&2
     exit 1
 fi
 
@@ -84,13 +102,14 @@ find_repo_root() {
 get_highest_from_specs() {
     local specs_dir="$1"
     local highest=0
+    local dir dirname number
     
     if [ -d "$specs_dir" ]; then
         for dir in "$specs_dir"/*; do
             [ -d "$dir" ] || continue
-            dirname=$(basename "$dir")
-            number=$(echo "$dirname" | grep -o '^[0-9]\+' || echo "0")
-            number=$((10#$number))
+            dirname="${dir##*/}"
+            [[ "$dirname" =~ ^([0-9]+) ]] || continue
+            number=$((10#${BASH_REMATCH[1]}))
             if [ "$number" -gt "$highest" ]; then
                 highest=$number
             fi
@@ -103,65 +122,183 @@ get_highest_from_specs() {
 # Function to get highest number from git branches
 get_highest_from_branches() {
     local highest=0
+    local ref clean_branch number
     
-    # Get all branches (local and remote)
-    branches=$(git branch -a 2>/dev/null || echo "")
-    
-    if [ -n "$branches" ]; then
-        while IFS= read -r branch; do
-            # Clean branch name: remove leading markers and remote prefixes
-            clean_branch=$(echo "$branch" | sed 's/^[* ]*//; s|^remotes/[^/]*/||')
-            
-            # Extract feature number if branch matches pattern ###-*
-            if echo "$clean_branch" | grep -q '^[0-9]\{3\}-'; then
-                number=$(echo "$clean_branch" | grep -o '^[0-9]\{3\}' || echo "0")
-                number=$((10#$number))
-                if [ "$number" -gt "$highest" ]; then
-                    highest=$number
-                fi
+    # Get all branches (local and remote) in a single git call
+    while IFS= read -r ref; do
+        # Clean branch name: remove ref namespace and remote prefixes
+        case "$ref" in
+            refs/heads/*) clean_branch="${ref#refs/heads/}" ;;
+            refs/remotes/*/*) clean_branch="${ref#refs/remotes/*/}" ;;
+            *) continue ;;
+        esac
+        
+        # Extract feature number if branch matches pattern ###-*
+        if [[ "$clean_branch" =~ ^([0-9]{3})- ]]; then
+            number=$((10#${BASH_REMATCH[1]}))
+            if [ "$number" -gt "$highest" ]; then
+                highest=$number
             fi
-        done <<< "$branches"
-    fi
+        fi
+    done < <(trace_cmd git for-each-ref --format='%(refname)' refs/heads refs/remotes 2>/dev/null)
     
     echo "$highest"
 }
 
+# Persistent index of used feature numbers. It caches the highest number seen in
+# branches and specs (rescanned only when refs or specs/ are newer than the index)
+# and the last number handed out, so allocation stays O(1) after warm-up. The
+# index and its lock live in the git common dir, shared by every worktree, and
+# fall back to specs/ only in repositories without git.
+FEATURE_INDEX_LOCK_DIR=""
+
+lock_feature_index() {
+    local index_file="$1"
+    
+    if command -v flock >/dev/null 2>&1; then
+        exec 9>"$index_file.lock"
+        if ! trace_cmd flock -w 60 9; then
+            echo "Error: Timed out waiting for lock on $index_file" >&2
+            exit 1
+        fi
+        return 0
+    fi
+    
+    # Fall back to an atomic mkdir lock where flock is unavailable (e.g. macOS)
+    local attempts=0
+    until mkdir "$index_file.lock.d" 2>/dev/null; do
+        attempts=$((attempts + 1))
+        if [ $attempts -ge 600 ]; then
+            echo "Error: Timed out waiting for lock on $index_file (remove $index_file.lock.d if stale)" >&2
+            exit 1
+        fi
+        sleep 0.1
+    done
+    FEATURE_INDEX_LOCK_DIR="$index_file.lock.d"
+    trap unlock_feature_index EXIT
+}
+
+unlock_feature_index() {
+    if [ -n "$FEATURE_INDEX_LOCK_DIR" ]; then
+        rmdir "$FEATURE_INDEX_LOCK_DIR" 2>/dev/null || true
+        FEATURE_INDEX_LOCK_DIR=""
+    else
+        exec 9>&-
+    fi
+}
+
+# Function to check whether any ref changed since the index was written
+refs_newer_than_index() {
+    local index_file="$1"
+    local git_dir="$2"
+    
+    [ -f "$index_file" ] || return 0
+    [ "$git_dir/packed-refs" -nt "$index_file" ] && return 0
+    [ -n "$(trace_cmd find "$git_dir/refs/heads" "$git_dir/refs/remotes" -newer "$index_file" -print -quit 2>/dev/null)" ]
+}
+
+# Function to reserve the next feature number(s) under the index lock; prints the first
+allocate_feature_number() {
+    local specs_dir="$1"
+    local has_git="$2"
+    local git_dir="$3"
+    local count="${4:-1}"
+    local index_file="$specs_dir/.feature-index"
+    local highest_branch=0
+    local highest_spec=0
+    local last_allocated=0
+    local key value
+    
+    # Keep the index and its lock out of the working tree whenever git is available
+    if [ "$has_git" = true ]; then
+        trace_cmd mkdir -p "$git_dir/specify"
+        index_file="$git_dir/specify/feature-index"
+    fi
+    
+    trace_call lock_feature_index "$index_file"
+    
+    if [ -f "$index_file" ]; then
+        while IFS='=' read -r key value; do
+            [[ "$value" =~ ^[0-9]+$ ]] || continue
+            case "$key" in
+                branches) highest_branch=$value ;;
+                specs) highest_spec=$value ;;
+                allocated) last_allocated=$value ;;
+            esac
+        done < "$index_file"
+    fi
+    
+    # Rescan only the sources that changed since the index was last written
+    if [ "$has_git" = true ] && trace_call refs_newer_than_index "$index_file" "$git_dir"; then
+        highest_branch=$(trace_call get_highest_from_branches)
+    fi
+    if [ ! -f "$index_file" ] || [ "$specs_dir" -nt "$index_file" ]; then
+        highest_spec=$(trace_call get_highest_from_specs "$specs_dir")
+    fi
+    
+    local max_num=$last_allocated
+    [ "$highest_branch" -gt "$max_num" ] && max_num=$highest_branch
+    [ "$highest_spec" -gt "$max_num" ] && max_num=$highest_spec
+    local next=$((max_num + 1))
+    
+    # Rewrite in place (not via rename) so specs/ itself is not touched when the
+    # index lives there
+    {
+        echo "# Feature number index maintained by create-new-feature.sh (safe to delete)"
+        echo "branches=$highest_branch"
+        echo "specs=$highest_spec"
+        echo "allocated=$((next + count - 1))"
+    } > "$index_file"
+    
+    unlock_feature_index
+    
+    echo "$next"
+}
+
 # Function to check existing branches (local and remote) and return next available number
 check_existing_branches() {
     local specs_dir="$1"
+    local git_dir="$2"
+    local count="${3:-1}"
 
     # Fetch all remotes to get latest branch info (suppress errors if no remotes)
-    git fetch --all --prune 2>/dev/null || true
-
-    # Get highest number from ALL branches (not just matching short name)
-    local highest_branch=$(get_highest_from_branches)
-
-    # Get highest number from ALL specs (not just matching short name)
-    local highest_spec=$(get_highest_from_specs "$specs_dir")
-
-    # Take the maximum of both
-    local max_num=$highest_branch
-    if [ "$highest_spec" -gt "$max_num" ]; then
-        max_num=$highest_spec
+    if [ "$OFFLINE_MODE" != true ]; then
+        trace_cmd git fetch --all --prune 2>/dev/null || true
     fi
 
-    # Return next number
-    echo $((max_num + 1))
+    # Take the maximum of ALL branches, ALL specs and numbers already handed out
+    allocate_feature_number "$specs_dir" true "$git_dir" "$count"
 }
 
 # Function to clean and format a branch name
 clean_branch_name() {
-    local name="$1"
-    echo "$name" | tr '[:upper:]' '[:lower:]' | sed 's/[^a-z0-9]/-/g' | sed 's/-\+/-/g' | sed 's/^-//' | sed 's/-$//'
+    local name
+    name=$(to_lower "$1")
+    name="${name//[^a-z0-9]/-}"
+    while [[ "$name" == *--* ]]; do
+        name="${name//--/-}"
+    done
+    name="${name#-}"
+    echo "${name%-}"
+}
+
+# Function to lowercase ASCII letters without forking
+to_lower() {
+    local LC_ALL=C
+    echo "${1,,}"
 }
 
 # Resolve repository root. Prefer git information when available, but fall back
 # to searching for repository markers so the workflow still functions in repositories that
 # were initialised with --no-git.
 SCRIPT_DIR="$(CDPATH="" cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+source "$SCRIPT_DIR/common.sh"
 
-if git rev-parse --show-toplevel >/dev/null 2>&1; then
-    REPO_ROOT=$(git rev-parse --show-toplevel)
+trace_begin phase repo-root
+if GIT_INFO=$(trace_cmd git rev-parse --show-toplevel --git-common-dir 2>/dev/null); then
+    REPO_ROOT="${GIT_INFO%%$'\n'*}"
+    GIT_COMMON_DIR="${GIT_INFO#*$'\n'}"
+    [[ "$GIT_COMMON_DIR" == /* ]] || GIT_COMMON_DIR="$PWD/$GIT_COMMON_DIR"
     HAS_GIT=true
 else
     REPO_ROOT="$(find_repo_root "$SCRIPT_DIR")"
@@ -171,11 +308,12 @@ else
     fi
     HAS_GIT=false
 fi
+trace_end
 
 cd "$REPO_ROOT"
 
 SPECS_DIR="$REPO_ROOT/specs"
-mkdir -p "$SPECS_DIR"
+trace_cmd mkdir -p "$SPECS_DIR"
 
 # Function to generate branch name with stop word filtering and length filtering
 generate_branch_name() {
@@ -185,7 +323,9 @@ generate_branch_name() {
     local stop_words="^(i|a|an|the|to|for|of|in|on|at|by|with|from|is|are|was|were|be|been|being|have|has|had|do|does|did|will|would|should|could|can|may|might|must|shall|this|that|these|those|my|your|our|their|want|need|add|get|set)$"
     
     # Convert to lowercase and split into words
-    local clean_name=$(echo "$description" | tr '[:upper:]' '[:lower:]' | sed 's/[^a-z0-9]/ /g')
+    local clean_name
+    clean_name=$(to_lower "$description")
+    clean_name="${clean_name//[^a-z0-9]/ }"
     
     # Filter words: remove stop words and words shorter than 3 chars (unless they're uppercase acronyms in original)
     local meaningful_words=()
@@ -194,10 +334,10 @@ generate_branch_name() {
         [ -z "$word" ] && continue
         
         # Keep words that are NOT stop words AND (length >= 3 OR are potential acronyms)
-        if ! echo "$word" | grep -qiE "$stop_words"; then
+        if ! [[ "$word" =~ $stop_words ]]; then
             if [ ${#word} -ge 3 ]; then
                 meaningful_words+=("$word")
-            elif echo "$description" | grep -q "\b${word^^}\b"; then
+            elif [[ "$description" =~ (^|[^[:alnum:]_])${word^^}([^[:alnum:]_]|$) ]]; then
                 # Keep short words if they appear as uppercase in original (likely acronyms)
                 meaningful_words+=("$word")
             fi
@@ -220,69 +360,245 @@ generate_branch_name() {
         echo "$result"
     else
         # Fallback to original logic if no meaningful words found
-        local cleaned=$(clean_branch_name "$description")
-        echo "$cleaned" | tr '-' '\n' | grep -v '^$' | head -3 | tr '\n' '-' | sed 's/-$//'
+        local cleaned
+        cleaned=$(clean_branch_name "$description")
+        local parts=()
+        IFS='-' read -r -a parts <<< "$cleaned"
+        local joined="${parts[*]:0:3}"
+        echo "${joined// /-}"
     fi
 }
 
+# Function to build BRANCH_NAME and FEATURE_NUM from a number and suffix
+build_branch_name() {
+    local number="$1"
+    local suffix="$2"
+
+    # Force base-10 interpretation to prevent octal conversion (e.g., 010 → 8 in octal, but should be 10 in decimal)
+    printf -v FEATURE_NUM "%03d" "$((10#$number))"
+    BRANCH_NAME="${FEATURE_NUM}-${suffix}"
+
+    # GitHub enforces a 244-byte limit on branch names
+    # Validate and truncate if necessary
+    local max_branch_length=244
+    if [ ${#BRANCH_NAME} -gt $max_branch_length ]; then
+        # Calculate how much we need to trim from suffix
+        # Account for: feature number (3) + hyphen (1) = 4 chars
+        local max_suffix_length=$((max_branch_length - 4))
+
+        # Truncate suffix, removing a trailing hyphen if truncation created one
+        local truncated_suffix="${suffix:0:$max_suffix_length}"
+        truncated_suffix="${truncated_suffix%-}"
+
+        local original_branch_name="$BRANCH_NAME"
+        BRANCH_NAME="${FEATURE_NUM}-${truncated_suffix}"
+
+        >&2 echo "[specify] Warning: Branch name exceeded GitHub's 244-byte limit"
+        >&2 echo "[specify] Original: $original_branch_name (${#original_branch_name} bytes)"
+        >&2 echo "[specify] Truncated to: $BRANCH_NAME (${#BRANCH_NAME} bytes)"
+    fi
+}
+
+# Function to extract a string or integer field from a flat JSON object
+json_field() {
+    local json="$1"
+    local key="$2"
+    local string_re="\"$key\"[[:space:]]*:[[:space:]]*\"(([^\"\\\\]|\\\\.)*)\""
+    local number_re="\"$key\"[[:space:]]*:[[:space:]]*([0-9]+)"
+
+    if [[ "$json" =~ $string_re ]]; then
+        local value="${BASH_REMATCH[1]}"
+        value="${value//\\\"/\"}"
+        value="${value//\\\//\/}"
+        value="${value//\\n/ }"
+        value="${value//\\t/ }"
+        echo "${value//\\\\/\\}"
+    elif [[ "$json" =~ $number_re ]]; then
+        echo "${BASH_REMATCH[1]}"
+    fi
+}
+
+# Function to create many features from JSONL on stdin with a single scan
+create_features_batch() {
+    local template="$REPO_ROOT/.specify/templates/spec-template.md"
+    local template_content=""
+    if [ -f "$template" ]; then
+        IFS= read -r -d '' template_content < "$template" || true
+    fi
+
+    local line line_no=0
+    local numbers=() suffixes=() errors=()
+    local description short_name number suffix
+    local auto_count=0
+
+    # Parse every request up front so numbers can be allocated in one go
+    trace_begin phase parse-requests
+    while IFS= read -r line || [ -n "$line" ]; do
+        line_no=$((line_no + 1))
+        [[ "$line" =~ ^[[:space:]]*$ ]] && continue
+
+        description=$(trace_call json_field "$line" description)
+        short_name=$(trace_call json_field "$line" short_name)
+        number=$(trace_call json_field "$line" number)
+
+        if [[ "$description$short_name" == *'\u'[0-9A-Fa-f][0-9A-Fa-f][0-9A-Fa-f][0-9A-Fa-f]* ]]; then
+            errors+=("line $line_no: \\\\uXXXX escapes are not supported; use literal UTF-8")
+            numbers+=("")
+            suffixes+=("")
+            continue
+        fi
+
+        if [ -n "$short_name" ]; then
+            suffix=$(trace_call clean_branch_name "$short_name")
+        elif [ -n "$description" ]; then
+            suffix=$(trace_call generate_branch_name "$description")
+        else
+            suffix=""
+        fi
+
+        if [ -z "$suffix" ]; then
+            errors+=("line $line_no: missing description")
+            numbers+=("")
+        elif [ -n "$number" ] && [[ ! "$number" =~ ^[0-9]+$ ]]; then
+            errors+=("line $line_no: number must be a non-negative integer")
+            numbers+=("")
+        else
+            errors+=("")
+            numbers+=("$number")
+            [ -z "$number" ] && auto_count=$((auto_count + 1))
+        fi
+        suffixes+=("$suffix")
+    done
+    trace_end
+
+    # Allocate consecutive numbers for every request without an explicit one
+    trace_begin phase allocate-number
+    local next=0
+    if [ $auto_count -gt 0 ]; then
+        if [ "$HAS_GIT" = true ]; then
+            next=$(check_existing_branches "$SPECS_DIR" "$GIT_COMMON_DIR" "$auto_count")
+        else
+            next=$(allocate_feature_number "$SPECS_DIR" false "" "$auto_count")
+        fi
+    fi
+    trace_end
+
+    # Resolve branch names and reject clashes with existing or earlier branches
+    trace_begin phase create-branches
+    local -A taken=()
+    local branch_names=() feature_nums=()
+    local ref i
+    if [ "$HAS_GIT" = true ]; then
+        while IFS= read -r ref; do
+            taken["${ref#refs/heads/}"]=1
+        done < <(trace_cmd git for-each-ref --format='%(refname)' refs/heads 2>/dev/null)
+    fi
+
+    local ref_updates=""
+    for i in "${!suffixes[@]}"; do
+        branch_names+=("")
+        feature_nums+=("")
+        [ -n "${errors[i]}" ] && continue
+
+        if [ -z "${numbers[i]}" ]; then
+            numbers[i]=$next
+            next=$((next + 1))
+        fi
+        build_branch_name "${numbers[i]}" "${suffixes[i]}"
+
+        if [ -n "${taken[$BRANCH_NAME]:-}" ]; then
+            errors[i]="branch already exists: $BRANCH_NAME"
+            continue
+        fi
+        taken["$BRANCH_NAME"]=1
+        branch_names[i]="$BRANCH_NAME"
+        feature_nums[i]="$FEATURE_NUM"
+        ref_updates+="create refs/heads/$BRANCH_NAME HEAD"$'\n'
+    done
+
+    # Create all branches in one transaction without switching the worktree
+    if [ "$HAS_GIT" = true ] && [ -n "$ref_updates" ]; then
+        local update_status=0
+        trace_begin cmd "git update-ref"
+        printf '%s' "$ref_updates" | git update-ref --stdin || update_status=$?
+        trace_end "$update_status" 2
+        if [ $update_status -ne 0 ]; then
+            echo "Error: Failed to create branches (does HEAD point to a commit?)" >&2
+            exit 1
+        fi
+    elif [ -n "$ref_updates" ]; then
+        >&2 echo "[specify] Warning: Git repository not detected; skipped branch creation"
+    fi
+    trace_end
+
+    trace_begin phase create-specs
+    local feature_dir spec_file status=0
+    for i in "${!suffixes[@]}"; do
+        if [ -n "${errors[i]}" ]; then
+            printf '{"ERROR":"%s"}\n' "${errors[i]}"
+            status=1
+            continue
+        fi
+
+        feature_dir="$SPECS_DIR/${branch_names[i]}"
+        spec_file="$feature_dir/spec.md"
+        trace_cmd mkdir -p "$feature_dir"
+        printf '%s' "$template_content" > "$spec_file"
+
+        printf '{"BRANCH_NAME":"%s","SPEC_FILE":"%s","FEATURE_NUM":"%s"}\n' "${branch_names[i]}" "$spec_file" "${feature_nums[i]}"
+    done
+    trace_end
+
+    # Batch mode ends here; it never continues into single-feature mode
+    exit $status
+}
+
+if $BATCH_MODE; then
+    create_features_batch
+fi
+
 # Generate branch name
+trace_begin phase branch-name
 if [ -n "$SHORT_NAME" ]; then
     # Use provided short name, just clean it up
-    BRANCH_SUFFIX=$(clean_branch_name "$SHORT_NAME")
+    BRANCH_SUFFIX=$(trace_call clean_branch_name "$SHORT_NAME")
 else
     # Generate from description with smart filtering
-    BRANCH_SUFFIX=$(generate_branch_name "$FEATURE_DESCRIPTION")
+    BRANCH_SUFFIX=$(trace_call generate_branch_name "$FEATURE_DESCRIPTION")
 fi
+trace_end
 
 # Determine branch number
+trace_begin phase allocate-number
 if [ -z "$BRANCH_NUMBER" ]; then
     if [ "$HAS_GIT" = true ]; then
         # Check existing branches on remotes
-        BRANCH_NUMBER=$(check_existing_branches "$SPECS_DIR")
+        BRANCH_NUMBER=$(check_existing_branches "$SPECS_DIR" "$GIT_COMMON_DIR")
     else
         # Fall back to local directory check
-        HIGHEST=$(get_highest_from_specs "$SPECS_DIR")
-        BRANCH_NUMBER=$((HIGHEST + 1))
+        BRANCH_NUMBER=$(allocate_feature_number "$SPECS_DIR" false "")
     fi
 fi
+trace_end
 
-# Force base-10 interpretation to prevent octal conversion (e.g., 010 → 8 in octal, but should be 10 in decimal)
-FEATURE_NUM=$(printf "%03d" "$((10#$BRANCH_NUMBER))")
-BRANCH_NAME="${FEATURE_NUM}-${BRANCH_SUFFIX}"
-
-# GitHub enforces a 244-byte limit on branch names
-# Validate and truncate if necessary
-MAX_BRANCH_LENGTH=244
-if [ ${#BRANCH_NAME} -gt $MAX_BRANCH_LENGTH ]; then
-    # Calculate how much we need to trim from suffix
-    # Account for: feature number (3) + hyphen (1) = 4 chars
-    MAX_SUFFIX_LENGTH=$((MAX_BRANCH_LENGTH - 4))
-    
-    # Truncate suffix at word boundary if possible
-    TRUNCATED_SUFFIX=$(echo "$BRANCH_SUFFIX" | cut -c1-$MAX_SUFFIX_LENGTH)
-    # Remove trailing hyphen if truncation created one
-    TRUNCATED_SUFFIX=$(echo "$TRUNCATED_SUFFIX" | sed 's/-$//')
-    
-    ORIGINAL_BRANCH_NAME="$BRANCH_NAME"
-    BRANCH_NAME="${FEATURE_NUM}-${TRUNCATED_SUFFIX}"
-    
-    >&2 echo "[specify] Warning: Branch name exceeded GitHub's 244-byte limit"
-    >&2 echo "[specify] Original: $ORIGINAL_BRANCH_NAME (${#ORIGINAL_BRANCH_NAME} bytes)"
-    >&2 echo "[specify] Truncated to: $BRANCH_NAME (${#BRANCH_NAME} bytes)"
-fi
+build_branch_name "$BRANCH_NUMBER" "$BRANCH_SUFFIX"
 
+trace_begin phase create-branch
 if [ "$HAS_GIT" = true ]; then
-    git checkout -b "$BRANCH_NAME"
+    trace_cmd git checkout -b "$BRANCH_NAME"
 else
     >&2 echo "[specify] Warning: Git repository not detected; skipped branch creation for $BRANCH_NAME"
 fi
+trace_end
 
+trace_begin phase create-spec
 FEATURE_DIR="$SPECS_DIR/$BRANCH_NAME"
-mkdir -p "$FEATURE_DIR"
+trace_cmd mkdir -p "$FEATURE_DIR"
 
 TEMPLATE="$REPO_ROOT/.specify/templates/spec-template.md"
 SPEC_FILE="$FEATURE_DIR/spec.md"
-if [ -f "$TEMPLATE" ]; then cp "$TEMPLATE" "$SPEC_FILE"; else touch "$SPEC_FILE"; fi
+if [ -f "$TEMPLATE" ]; then trace_cmd cp "$TEMPLATE" "$SPEC_FILE"; else touch "$SPEC_FILE"; fi
+trace_end
 
 # Set the SPECIFY_FEATURE environment variable for the current session
 export SPECIFY_FEATURE="$BRANCH_NAME"
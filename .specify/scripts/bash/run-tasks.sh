@@ -0,0 +1,597 @@
+#!/usr/bin/env bash
+
+# Execute the tasks in tasks.md as a dependency graph
+#
+# This script parses the task list format defined by tasks-template.md
+# (`- [ ] T001 [P] [US1] Description with path`) into a DAG and runs it on a
+# bounded worker pool, so tasks marked [P] proceed concurrently.
+#
+# DEPENDENCIES:
+#   - Phases (## headings) and **Checkpoint** lines are barriers: the first tasks
+#     after one wait for every task before it
+#   - Within a phase, a task without [P] waits for everything since the previous
+#     sequential task; a [P] task only waits for that sequential task
+#   - Tasks that mention the same file path run in document order
+#   - "depends on T012, T013" in a description adds explicit edges
+#
+# Usage: ./run-tasks.sh [OPTIONS]
+#
+# OPTIONS:
+#   --tasks FILE        tasks.md to run (default: tasks.md of the current feature)
+#   --exec CMD          Executor command, run via bash -c with the task id and
+#                       description as $1 and $2 (or SPECIFY_TASK_EXECUTOR)
+#   --jobs N            Maximum concurrent tasks (default: CPU count)
+#   --dry-run           Print the schedule and graph metrics without executing
+#   --json              Print the final report as JSON
+#   --help, -h          Show help message
+#
+# The executor also receives TASK_ID, TASK_DESCRIPTION, TASK_STORY,
+# TASK_PARALLEL and TASKS_FILE in its environment. Completed tasks are ticked
+# ([X]) in tasks.md with an atomic rename as soon as they finish; tasks that are
+# already ticked are treated as done.
+
+set -e
+set -u
+set -o pipefail
+
+#==============================================================================
+# Configuration and Global Variables
+#==============================================================================
+
+TASKS_FILE=""
+EXECUTOR="${SPECIFY_TASK_EXECUTOR:-}"
+JOBS=""
+DRY_RUN=false
+JSON_MODE=false
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --tasks|--exec|--jobs)
+            if [[ $# -lt 2 || "$2" == --* ]]; then
+                echo "ERROR: $1 requires a value" >&2
+                exit 1
+            fi
+            case "$1" in
+                --tasks) TASKS_FILE="$2" ;;
+                --exec) EXECUTOR="$2" ;;
+                --jobs) JOBS="$2" ;;
+            esac
+            shift
+            ;;
+        --dry-run)
+            DRY_RUN=true
+            ;;
+        --json)
+            JSON_MODE=true
+            ;;
+        --help|-h)
+            cat << 'EOF'
+Usage: run-tasks.sh [OPTIONS]
+
+Run the tasks in tasks.md as a dependency graph, dispatching [P] tasks concurrently.
+
+OPTIONS:
+  --tasks FILE        tasks.md to run (default: tasks.md of the current feature)
+  --exec CMD          Executor command, run via bash -c with the task id and
+                      description as $1 and $2 (or SPECIFY_TASK_EXECUTOR)
+  --jobs N            Maximum concurrent tasks (default: CPU count)
+  --dry-run           Print the schedule and graph metrics without executing
+  --json              Print the final report as JSON
+  --help, -h          Show this help message
+
+EXAMPLES:
+  # Inspect the critical path and available parallelism
+  ./run-tasks.sh --dry-run
+
+  # Run every open task with up to 4 agents at once
+  ./run-tasks.sh --jobs 4 --exec 'my-agent implement "$1: $2"'
+
+EOF
+            exit 0
+            ;;
+        *)
+            echo "ERROR: Unknown option '$1'. Use --help for usage information." >&2
+            exit 1
+            ;;
+    esac
+    shift
+done
+
+if [[ -n "$JOBS" && ! "$JOBS" =~ ^[1-9][0-9]*$ ]]; then
+    echo "ERROR: --jobs requires a positive integer" >&2
+    exit 1
+fi
+JOBS="${JOBS:-$(getconf _NPROCESSORS_ONLN 2>/dev/null || echo 4)}"
+
+SCRIPT_DIR="$(CDPATH="" cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+source "$SCRIPT_DIR/common.sh"
+
+if [[ -z "$TASKS_FILE" ]]; then
+    eval $(get_feature_paths)
+    TASKS_FILE="$TASKS"
+fi
+
+if [[ ! -f "$TASKS_FILE" ]]; then
+    echo "ERROR: tasks.md not found at $TASKS_FILE" >&2
+    echo "Run /speckit.tasks first to create the task list." >&2
+    exit 1
+fi
+
+if ! $DRY_RUN && [[ -z "$EXECUTOR" ]]; then
+    echo "ERROR: No executor configured. Pass --exec CMD or set SPECIFY_TASK_EXECUTOR." >&2
+    exit 1
+fi
+
+# Parsed tasks, indexed in document order (which is also a topological order)
+TASK_IDS=()
+TASK_DESCS=()
+TASK_STORIES=()
+TASK_PARALLEL=()
+TASK_DEPS=()
+TASK_STATE=()      # pending | running | done | failed | blocked
+TASK_OPEN=()       # true if the task was unticked when tasks.md was parsed
+TASK_DURATION=()   # milliseconds, for tasks run in this session
+
+LOG_DIR=""
+
+log_info() {
+    echo "INFO: $1" >&2
+}
+
+log_error() {
+    echo "ERROR: $1" >&2
+}
+
+cleanup() {
+    local exit_code=$?
+    rm -f "$TASKS_FILE.tmp.$$"
+    exit $exit_code
+}
+
+trap cleanup EXIT INT TERM
+
+#==============================================================================
+# Parsing
+#==============================================================================
+
+# Print the file paths mentioned in a task description, one per line
+extract_task_paths() {
+    # "]" must come first to be literal inside a bracket expression
+    local path_re='^[][A-Za-z0-9_./-]+$'
+    local word words=()
+    read -r -a words <<< "$1"
+    for word in "${words[@]}"; do
+        word="${word%[,;:.)]}"
+        word="${word#[(\`]}"
+        word="${word%\`}"
+        [[ "$word" == */* && "$word" =~ $path_re ]] && echo "$word"
+    done
+    return 0
+}
+
+parse_tasks() {
+    local task_re='^[[:space:]]*-[[:space:]]+\[([ xX])\][[:space:]]+(T[0-9]+)[[:space:]]*(.*)$'
+    local line mark id rest story parallel
+    local -A index_of=()
+    local -A last_writer=()
+
+    # Dependency bookkeeping (see header for the rules)
+    local segment_entry=()   # tasks the first task of a segment depends on
+    local segment_tasks=()   # all tasks in the current segment
+    local anchor=""          # latest sequential task in the segment
+    local since_anchor=()    # anchor plus [P] tasks started after it
+
+    close_segment() {
+        if [[ ${#segment_tasks[@]} -gt 0 ]]; then
+            segment_entry=("${segment_tasks[@]}")
+        fi
+        segment_tasks=()
+        anchor=""
+        since_anchor=()
+    }
+
+    while IFS= read -r line || [[ -n "$line" ]]; do
+        if [[ "$line" == "## "* || "$line" == "**Checkpoint**"* ]]; then
+            close_segment
+            continue
+        fi
+        [[ "$line" =~ $task_re ]] || continue
+
+        mark="${BASH_REMATCH[1]}"
+        id="${BASH_REMATCH[2]}"
+        rest="${BASH_REMATCH[3]}"
+        parallel=false
+        story=""
+
+        if [[ "$rest" =~ ^\[P\][[:space:]]*(.*)$ ]]; then
+            parallel=true
+            rest="${BASH_REMATCH[1]}"
+        fi
+        if [[ "$rest" =~ ^\[(US[0-9]+)\][[:space:]]*(.*)$ ]]; then
+            story="${BASH_REMATCH[1]}"
+            rest="${BASH_REMATCH[2]}"
+        fi
+
+        local i=${#TASK_IDS[@]}
+        local deps=()
+
+        if $parallel; then
+            if [[ -n "$anchor" ]]; then
+                deps+=("$anchor")
+            else
+                deps+=("${segment_entry[@]}")
+            fi
+            since_anchor+=("$i")
+        else
+            if [[ ${#since_anchor[@]} -gt 0 ]]; then
+                deps+=("${since_anchor[@]}")
+            else
+                deps+=("${segment_entry[@]}")
+            fi
+            anchor="$i"
+            since_anchor=("$i")
+        fi
+        segment_tasks+=("$i")
+
+        # Explicit "depends on T012, T013" references to earlier tasks
+        if [[ "$rest" == *"depends on"* ]]; then
+            local ref refs="${rest#*depends on}"
+            while [[ "$refs" =~ (T[0-9]+)(.*)$ ]]; do
+                ref="${BASH_REMATCH[1]}"
+                refs="${BASH_REMATCH[2]}"
+                if [[ -n "${index_of[$ref]:-}" ]]; then
+                    deps+=("${index_of[$ref]}")
+                else
+                    log_error "$id depends on unknown or later task $ref; ignoring"
+                fi
+            done
+        fi
+
+        # Tasks touching the same file run in document order
+        local path
+        while IFS= read -r path; do
+            [[ -z "$path" ]] && continue
+            [[ -n "${last_writer[$path]:-}" ]] && deps+=("${last_writer[$path]}")
+            last_writer["$path"]="$i"
+        done < <(extract_task_paths "$rest")
+
+        # Deduplicate dependencies
+        local -A seen=()
+        local dep unique=""
+        for dep in "${deps[@]}"; do
+            [[ -n "${seen[$dep]:-}" || "$dep" == "$i" ]] && continue
+            seen["$dep"]=1
+            unique+="$dep "
+        done
+        unset seen
+
+        index_of["$id"]="$i"
+        TASK_IDS+=("$id")
+        TASK_DESCS+=("$rest")
+        TASK_STORIES+=("$story")
+        TASK_PARALLEL+=("$parallel")
+        TASK_DEPS+=("${unique% }")
+        if [[ "$mark" == " " ]]; then
+            TASK_STATE+=("pending")
+            TASK_OPEN+=(true)
+        else
+            TASK_STATE+=("done")
+            TASK_OPEN+=(false)
+        fi
+        TASK_DURATION+=(0)
+    done < "$TASKS_FILE"
+
+    unset -f close_segment
+}
+
+#==============================================================================
+# Graph Metrics
+#==============================================================================
+
+# Longest path through the open tasks, weighted by the given per-task weights
+# (an array name). Sets PATH_LENGTH and PATH_TASKS (space-separated ids).
+compute_critical_path() {
+    local weights_name="$1"
+    local -a finish=() previous=()
+    local i dep best best_dep weight
+    local end=-1
+    PATH_LENGTH=0
+
+    for ((i=0; i<${#TASK_IDS[@]}; i++)); do
+        best=0
+        best_dep=-1
+        for dep in ${TASK_DEPS[i]}; do
+            if [[ ${finish[dep]} -gt $best ]]; then
+                best=${finish[dep]}
+                best_dep=$dep
+            fi
+        done
+
+        weight=0
+        if [[ "${TASK_OPEN[i]}" == true ]]; then
+            eval "weight=\${$weights_name[i]}"
+        fi
+        finish[i]=$((best + weight))
+        previous[i]=$best_dep
+
+        if [[ ${finish[i]} -gt $PATH_LENGTH ]]; then
+            PATH_LENGTH=${finish[i]}
+            end=$i
+        fi
+    done
+
+    PATH_TASKS=""
+    while [[ $end -ge 0 ]]; do
+        PATH_TASKS="${TASK_IDS[end]} $PATH_TASKS"
+        end=${previous[end]}
+    done
+    PATH_TASKS="${PATH_TASKS% }"
+}
+
+# Peak width of the as-soon-as-possible schedule of open tasks (unit durations)
+compute_max_parallelism() {
+    local -a level=() width=()
+    local i dep lvl
+    MAX_PARALLELISM=0
+
+    for ((i=0; i<${#TASK_IDS[@]}; i++)); do
+        lvl=0
+        for dep in ${TASK_DEPS[i]}; do
+            [[ ${level[dep]} -gt $lvl ]] && lvl=${level[dep]}
+        done
+        if [[ "${TASK_OPEN[i]}" != true ]]; then
+            level[i]=$lvl
+            continue
+        fi
+        lvl=$((lvl + 1))
+        level[i]=$lvl
+        width[lvl]=$(( ${width[lvl]:-0} + 1 ))
+        [[ ${width[lvl]} -gt $MAX_PARALLELISM ]] && MAX_PARALLELISM=${width[lvl]}
+    done
+    return 0
+}
+
+# Number of open tasks reachable from each task, used to start long chains first
+compute_priorities() {
+    local i dep
+    TASK_PRIORITY=()
+    for ((i=0; i<${#TASK_IDS[@]}; i++)); do
+        TASK_PRIORITY[i]=1
+    done
+    for ((i=${#TASK_IDS[@]}-1; i>=0; i--)); do
+        for dep in ${TASK_DEPS[i]}; do
+            [[ $((TASK_PRIORITY[i] + 1)) -gt ${TASK_PRIORITY[dep]} ]] && TASK_PRIORITY[dep]=$((TASK_PRIORITY[i] + 1))
+        done
+    done
+    return 0
+}
+
+#==============================================================================
+# Execution
+#==============================================================================
+
+# Tick a task's checkbox in tasks.md, replacing the file with an atomic rename
+mark_task_done() {
+    local id="$1"
+    local lines=()
+    local i
+
+    mapfile -t lines < "$TASKS_FILE"
+    for i in "${!lines[@]}"; do
+        if [[ "${lines[i]}" =~ ^([[:space:]]*-[[:space:]]+\[)\ (\][[:space:]]+$id)([^0-9].*)?$ ]]; then
+            lines[i]="${BASH_REMATCH[1]}X${BASH_REMATCH[2]}${BASH_REMATCH[3]}"
+            printf '%s\n' "${lines[@]}" > "$TASKS_FILE.tmp.$$"
+            trace_cmd mv -f "$TASKS_FILE.tmp.$$" "$TASKS_FILE"
+            return 0
+        fi
+    done
+    return 0
+}
+
+deps_done() {
+    local dep
+    for dep in ${TASK_DEPS[$1]}; do
+        [[ "${TASK_STATE[dep]}" == "done" ]] || return 1
+    done
+    return 0
+}
+
+start_task() {
+    local i="$1"
+    TASK_STATE[i]="running"
+    log_info "Starting ${TASK_IDS[i]}: ${TASK_DESCS[i]}"
+
+    (
+        trace_begin cmd "task ${TASK_IDS[i]}"
+        started=$(get_epoch_ms)
+        rc=0
+        TASK_ID="${TASK_IDS[i]}" \
+        TASK_DESCRIPTION="${TASK_DESCS[i]}" \
+        TASK_STORY="${TASK_STORIES[i]}" \
+        TASK_PARALLEL="${TASK_PARALLEL[i]}" \
+        TASKS_FILE="$TASKS_FILE" \
+            bash -c "$EXECUTOR" run-task "${TASK_IDS[i]}" "${TASK_DESCS[i]}" \
+            > "$LOG_DIR/${TASK_IDS[i]}.log" 2>&1 < /dev/null || rc=$?
+        finished=$(get_epoch_ms)
+        trace_end "$rc" 2
+        # Publish the status with a rename so the scheduler never reads it half-written
+        echo "$rc $((finished - started))" > "$LOG_DIR/${TASK_IDS[i]}.status.tmp"
+        mv -f "$LOG_DIR/${TASK_IDS[i]}.status.tmp" "$LOG_DIR/${TASK_IDS[i]}.status"
+    ) &
+}
+
+run_schedule() {
+    local running=0
+    local failed=false
+    local i best rc elapsed
+
+    LOG_DIR=$(trace_cmd mktemp -d)
+    compute_priorities
+
+    while true; do
+        # Launch the ready tasks with the longest remaining chains first
+        while ! $failed && [[ $running -lt $JOBS ]]; do
+            best=-1
+            for ((i=0; i<${#TASK_IDS[@]}; i++)); do
+                [[ "${TASK_STATE[i]}" == "pending" ]] || continue
+                deps_done "$i" || continue
+                if [[ $best -lt 0 || ${TASK_PRIORITY[i]} -gt ${TASK_PRIORITY[best]} ]]; then
+                    best=$i
+                fi
+            done
+            [[ $best -ge 0 ]] || break
+            start_task "$best"
+            running=$((running + 1))
+        done
+
+        [[ $running -gt 0 ]] || break
+
+        local wait_rc=0
+        wait -n || wait_rc=$?
+
+        for ((i=0; i<${#TASK_IDS[@]}; i++)); do
+            [[ "${TASK_STATE[i]}" == "running" ]] || continue
+            if [[ -f "$LOG_DIR/${TASK_IDS[i]}.status" ]]; then
+                read -r rc elapsed < "$LOG_DIR/${TASK_IDS[i]}.status"
+            elif [[ $wait_rc -eq 127 ]]; then
+                # No children left, yet this task never reported back
+                rc=1
+                elapsed=0
+            else
+                continue
+            fi
+
+            running=$((running - 1))
+            TASK_DURATION[i]=$elapsed
+            if [[ $rc -eq 0 ]]; then
+                TASK_STATE[i]="done"
+                mark_task_done "${TASK_IDS[i]}"
+                log_info "Finished ${TASK_IDS[i]} in ${elapsed} ms"
+            else
+                TASK_STATE[i]="failed"
+                failed=true
+                log_error "${TASK_IDS[i]} failed with exit code $rc (log: $LOG_DIR/${TASK_IDS[i]}.log)"
+            fi
+        done
+    done
+
+    for ((i=0; i<${#TASK_IDS[@]}; i++)); do
+        [[ "${TASK_STATE[i]}" == "pending" ]] && TASK_STATE[i]="blocked"
+    done
+    return 0
+}
+
+#==============================================================================
+# Reporting
+#==============================================================================
+
+print_dry_run() {
+    local i dep deps
+    for ((i=0; i<${#TASK_IDS[@]}; i++)); do
+        deps=""
+        for dep in ${TASK_DEPS[i]}; do
+            deps+="${TASK_IDS[dep]},"
+        done
+        printf '%s\t%s\t%s\tdepends on: %s\n' "${TASK_IDS[i]}" "${TASK_STATE[i]}" \
+            "$([[ "${TASK_PARALLEL[i]}" == true ]] && echo P || echo -)" "${deps%,}" >&2
+    done
+}
+
+print_report() {
+    local total=${#TASK_IDS[@]}
+    local done_count=0 failed_count=0 blocked_count=0 pending_count=0 ran_count=0
+    local serial_ms=0 i
+
+    for ((i=0; i<total; i++)); do
+        case "${TASK_STATE[i]}" in
+            done) done_count=$((done_count + 1)) ;;
+            failed) failed_count=$((failed_count + 1)) ;;
+            blocked) blocked_count=$((blocked_count + 1)) ;;
+            pending) pending_count=$((pending_count + 1)) ;;
+        esac
+        if [[ "${TASK_OPEN[i]}" == true && "${TASK_STATE[i]}" =~ ^(done|failed)$ ]]; then
+            ran_count=$((ran_count + 1))
+            serial_ms=$((serial_ms + TASK_DURATION[i]))
+        fi
+    done
+
+    local -a unit_weights=()
+    for ((i=0; i<total; i++)); do
+        unit_weights[i]=1
+    done
+    compute_critical_path unit_weights
+    local path_tasks="$PATH_TASKS" path_count=$PATH_LENGTH
+
+    local path_ms=0
+    if [[ $ran_count -gt 0 ]]; then
+        compute_critical_path TASK_DURATION
+        path_ms=$PATH_LENGTH
+    fi
+
+    if $JSON_MODE; then
+        local json_path="" id
+        for id in $path_tasks; do
+            json_path+="\"$id\","
+        done
+        printf '{"TASKS_FILE":"%s","TOTAL":%d,"DONE":%d,"FAILED":%d,"BLOCKED":%d,"PENDING":%d,"RAN":%d,"JOBS":%d,"MAX_PARALLELISM":%d,"CRITICAL_PATH":[%s],"CRITICAL_PATH_MS":%d,"SERIAL_MS":%d,"WALL_MS":%d}\n' \
+            "$TASKS_FILE" "$total" "$done_count" "$failed_count" "$blocked_count" "$pending_count" "$ran_count" "$JOBS" \
+            "$MAX_PARALLELISM" "${json_path%,}" "$path_ms" "$serial_ms" "$WALL_MS"
+    else
+        echo "TASKS_FILE: $TASKS_FILE"
+        echo "TASKS: $total total, $done_count done, $failed_count failed, $blocked_count blocked, $pending_count pending"
+        echo "MAX_PARALLELISM: $MAX_PARALLELISM (jobs: $JOBS)"
+        echo "CRITICAL_PATH: $path_count task(s): ${path_tasks// / -> }"
+        if [[ $ran_count -gt 0 ]]; then
+            echo "CRITICAL_PATH_TIME: ${path_ms} ms"
+            echo "SERIAL_TIME: ${serial_ms} ms"
+            echo "WALL_TIME: ${WALL_MS} ms"
+            if [[ $WALL_MS -gt 0 ]]; then
+                echo "SPEEDUP: $((serial_ms * 100 / WALL_MS / 100)).$(printf '%02d' $((serial_ms * 100 / WALL_MS % 100)))x"
+            fi
+        fi
+    fi
+}
+
+#==============================================================================
+# Main Execution
+#==============================================================================
+
+main() {
+    trace_begin phase parse-tasks
+    parse_tasks
+    if [[ ${#TASK_IDS[@]} -eq 0 ]]; then
+        log_error "No tasks found in $TASKS_FILE"
+        exit 1
+    fi
+
+    # Parallelism is a property of the graph, so measure it before running
+    compute_max_parallelism
+    trace_end
+
+    WALL_MS=0
+    trace_begin phase schedule
+    if $DRY_RUN; then
+        print_dry_run
+    else
+        local started finished
+        started=$(get_epoch_ms)
+        run_schedule
+        finished=$(get_epoch_ms)
+        WALL_MS=$((finished - started))
+    fi
+    trace_end
+
+    trace_begin phase report
+    print_report
+    trace_end
+
+    # Keep executor logs around when something went wrong
+    local i
+    for ((i=0; i<${#TASK_IDS[@]}; i++)); do
+        [[ "${TASK_STATE[i]}" == "failed" || "${TASK_STATE[i]}" == "blocked" ]] && exit 1
+    done
+    [[ -n "$LOG_DIR" ]] && trace_cmd rm -rf "$LOG_DIR"
+    exit 0
+}
+
+main
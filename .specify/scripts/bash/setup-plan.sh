@@ -11,10 +11,14 @@ for arg in "$@"; do
         --json) 
             JSON_MODE=true 
             ;;
+        --no-cache)
+            export SPECIFY_NO_CACHE=1
+            ;;
         --help|-h) 
-            echo "Usage: $0 [--json]"
-            echo "  --json    Output results in JSON format"
-            echo "  --help    Show this help message"
+            echo "Usage: $0 [--json] [--no-cache]"
+            echo "  --json      Output results in JSON format"
+            echo "  --no-cache  Resolve paths from git instead of the cached context"
+            echo "  --help      Show this help message"
             exit 0 
             ;;
         *) 
@@ -34,18 +38,20 @@ eval $(get_feature_paths)
 check_feature_branch "$CURRENT_BRANCH" "$HAS_GIT" || exit 1
 
 # Ensure the feature directory exists
-mkdir -p "$FEATURE_DIR"
+trace_begin phase copy-plan
+trace_cmd mkdir -p "$FEATURE_DIR"
 
 # Copy plan template if it exists
 TEMPLATE="$REPO_ROOT/.specify/templates/plan-template.md"
 if [[ -f "$TEMPLATE" ]]; then
-    cp "$TEMPLATE" "$IMPL_PLAN"
+    trace_cmd cp "$TEMPLATE" "$IMPL_PLAN"
     echo "Copied plan template to $IMPL_PLAN"
 else
     echo "Warning: Plan template not found at $TEMPLATE"
     # Create a basic plan file if template doesn't exist
-    touch "$IMPL_PLAN"
+    trace_cmd touch "$IMPL_PLAN"
 fi
+trace_end
 
 # Output results
 if $JSON_MODE; then
@@ -0,0 +1,828 @@
+#!/usr/bin/env bash
+
+# Incremental index over every feature's Markdown artifacts
+#
+# Indexes specs/*/*.md and specs/*/checklists/*.md by ID (FR-###, SC-###, T###,
+# CHK###), user story (US#), NEEDS CLARIFICATION marker, file path and term, so
+# cross-feature questions are answered from the index instead of a grep over
+# specs/. The index lives in .git/specify/spec-index (or .specify/cache/spec-index
+# outside git). Every query first refreshes it: a single find against the last
+# update stamp settles the common case, otherwise one stat call finds changed
+# files, a cksum pass filters out files whose content did not change, and only
+# the remaining files are re-parsed. Their postings go into a small new segment
+# that supersedes the older postings for those files, so an edit never rewrites
+# the whole index; segments are folded back into one base after a handful of
+# updates or whenever most of the tree changed.
+#
+# Usage: ./spec-index.sh [OPTIONS] COMMAND [ARGS...]
+#
+# COMMANDS:
+#   update              Refresh the index and report what was re-parsed
+#   rebuild             Discard the index and build it from scratch
+#   id KEY...           Every posting for the given IDs (FR-001, SC-002, T014, CHK003, US2)
+#   story US#           Tasks tagged with a user story
+#   clarifications      Features with NEEDS CLARIFICATION markers, with their locations
+#   term WORD...        Files containing every word (WORD* matches a prefix), best first
+#   file PATH           Everything indexed from one file
+#   trace               Traceability gaps; exits 1 if any are found
+#
+# OPTIONS:
+#   --feature NAME      Only report features named NAME or numbered NAME (e.g. 004)
+#   --json              Output one JSON object per line
+#   --no-refresh        Query the index as it is, without looking for changed files
+#   --help, -h          Show help message
+#
+# OUTPUTS:
+#   Update:    {"INDEX_DIR":"...","FILES":N,"PARSED":N,"REMOVED":N,"SEGMENTS":N}
+#   Postings:  {"ID":"...","TYPE":"...","FEATURE":"...","PATH":"...","LINE":N,"STATE":"...","RELATED":"...","TEXT":"..."}
+#              TYPE is requirement, criterion, task, check, story, story-task, ref or clarification.
+#              STATE is open/done for tasks and checklist items. RELATED is the task phase for
+#              tasks, the tagged task for story-task, the priority for story and the ID of the
+#              enclosing item for ref and clarification.
+#   Terms:     {"PATH":"...","FEATURE":"...","SCORE":N}
+#   Trace:     {"FEATURE":"...","CHECK":"...","ID":"...","PATH":"...","LINE":N}
+
+set -e
+
+JSON_MODE=false
+REFRESH=true
+FEATURE_FILTER=""
+EXPECT_FEATURE=false
+COMMAND=""
+ARGS=()
+
+for arg in "$@"; do
+    if $EXPECT_FEATURE; then
+        FEATURE_FILTER="$arg"
+        EXPECT_FEATURE=false
+        continue
+    fi
+
+    case "$arg" in
+        --json)
+            JSON_MODE=true
+            ;;
+        --no-refresh)
+            REFRESH=false
+            ;;
+        --feature)
+            EXPECT_FEATURE=true
+            ;;
+        --help|-h)
+            cat << 'EOF'
+Usage: spec-index.sh [OPTIONS] COMMAND [ARGS...]
+
+Query an incremental index of IDs, user stories, clarification markers and terms
+across every feature in specs/.
+
+COMMANDS:
+  update              Refresh the index and report what was re-parsed
+  rebuild             Discard the index and build it from scratch
+  id KEY...           Every posting for the given IDs (FR-001, SC-002, T014, CHK003, US2)
+  story US#           Tasks tagged with a user story
+  clarifications      Features with NEEDS CLARIFICATION markers, with their locations
+  term WORD...        Files containing every word (WORD* matches a prefix), best first
+  file PATH           Everything indexed from one file
+  trace               Traceability gaps; exits 1 if any are found:
+                        requirement-without-task  FR-### not referenced by any task
+                        task-without-story        task outside Setup/Foundational/Polish
+                                                  phases without a [US#] tag
+                        unknown-story             [US#] tag with no matching story in the spec
+                        story-without-task        user story no task is tagged with
+                      Only features with at least one task are checked.
+
+OPTIONS:
+  --feature NAME      Only report features named NAME or numbered NAME (e.g. 004)
+  --json              Output one JSON object per line
+  --no-refresh        Query the index as it is, without looking for changed files
+  --help, -h          Show this help message
+
+EXAMPLES:
+  # Which features still have unresolved clarifications?
+  ./spec-index.sh clarifications
+
+  # Which tasks cover US2 across all specs?
+  ./spec-index.sh --json story US2
+
+  # Release gate: every requirement has a task and every task a story
+  ./spec-index.sh trace
+
+EOF
+            exit 0
+            ;;
+        -*)
+            echo "ERROR: Unknown option '$arg'. Use --help for usage information." >&2
+            exit 1
+            ;;
+        *)
+            if [[ -z "$COMMAND" ]]; then
+                COMMAND="$arg"
+            else
+                ARGS+=("$arg")
+            fi
+            ;;
+    esac
+done
+
+if $EXPECT_FEATURE; then
+    echo "ERROR: --feature requires a feature name or number" >&2
+    exit 1
+fi
+
+case "$COMMAND" in
+    update|rebuild|clarifications|trace)
+        ;;
+    id|term)
+        if [[ ${#ARGS[@]} -eq 0 ]]; then
+            echo "ERROR: '$COMMAND' requires at least one argument" >&2
+            exit 1
+        fi
+        ;;
+    story|file)
+        if [[ ${#ARGS[@]} -ne 1 ]]; then
+            echo "ERROR: '$COMMAND' requires exactly one argument" >&2
+            exit 1
+        fi
+        ;;
+    "")
+        echo "ERROR: No command given. Use --help for usage information." >&2
+        exit 1
+        ;;
+    *)
+        echo "ERROR: Unknown command '$COMMAND'. Use --help for usage information." >&2
+        exit 1
+        ;;
+esac
+
+# Source common functions
+SCRIPT_DIR="$(CDPATH="" cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+source "$SCRIPT_DIR/common.sh"
+
+eval $(get_feature_paths)
+
+if locate_git_dir; then
+    INDEX_DIR="$SPECIFY_GIT_DIR/specify/spec-index"
+else
+    INDEX_DIR="$REPO_ROOT/.specify/cache/spec-index"
+fi
+
+# Index paths are relative to the repository root
+cd "$REPO_ROOT"
+
+WORK_DIR=""
+INDEX_LOCK_DIR=""
+
+# Segments added by refreshes before they are folded back into the base
+MAX_SEGMENTS=8
+
+cleanup() {
+    local exit_code=$?
+    [[ -n "$WORK_DIR" ]] && rm -rf "$WORK_DIR"
+    [[ -n "$INDEX_LOCK_DIR" ]] && rmdir "$INDEX_LOCK_DIR" 2>/dev/null
+    exit $exit_code
+}
+
+trap cleanup EXIT INT TERM
+
+#==============================================================================
+# Index Maintenance
+#==============================================================================
+
+lock_index() {
+    if command -v flock >/dev/null 2>&1; then
+        exec 9>"$INDEX_DIR/lock"
+        if ! trace_cmd flock -w 60 9; then
+            echo "ERROR: Timed out waiting for lock on $INDEX_DIR" >&2
+            exit 1
+        fi
+        return 0
+    fi
+
+    # Fall back to an atomic mkdir lock where flock is unavailable (e.g. macOS)
+    local attempts=0
+    until mkdir "$INDEX_DIR/lock.d" 2>/dev/null; do
+        attempts=$((attempts + 1))
+        if [[ $attempts -ge 600 ]]; then
+            echo "ERROR: Timed out waiting for lock on $INDEX_DIR (remove $INDEX_DIR/lock.d if stale)" >&2
+            exit 1
+        fi
+        sleep 0.1
+    done
+    INDEX_LOCK_DIR="$INDEX_DIR/lock.d"
+}
+
+unlock_index() {
+    if [[ -n "$INDEX_LOCK_DIR" ]]; then
+        rmdir "$INDEX_LOCK_DIR" 2>/dev/null || true
+        INDEX_LOCK_DIR=""
+    else
+        exec 9>&-
+    fi
+}
+
+# True when nothing under specs/ changed since the last update. Edits touch the
+# file, while additions, deletions and renames touch the enclosing directory.
+index_is_fresh() {
+    [[ -f "$INDEX_DIR/stamp" && -f "$INDEX_DIR/files.tsv" ]] || return 1
+    [[ -d specs ]] || return 0
+    [[ -z "$(trace_cmd find specs -newer "$INDEX_DIR/stamp" -print -quit 2>/dev/null)" ]]
+}
+
+# Print "<mtime> <size> <path>" for every path using a single stat call
+stat_files() {
+    [[ $# -eq 0 ]] && return 0
+    if stat -c '%Y' / >/dev/null 2>&1; then
+        trace_cmd stat -c '%Y %s %n' -- "$@" 2>/dev/null || true
+    else
+        trace_cmd stat -f '%m %z %N' -- "$@" 2>/dev/null || true
+    fi
+}
+
+# Parse Markdown files into ID postings ($1) and per-file term counts ($2)
+parse_files() {
+    local ids_out="$1"
+    local terms_out="$2"
+    shift 2
+
+    : > "$ids_out"
+    : > "$terms_out"
+    [[ $# -eq 0 ]] && return 0
+
+    trace_begin cmd "awk parse"
+    LC_ALL=C awk -v ids_out="$ids_out" -v terms_out="$terms_out" '
+    function clean(s) {
+        gsub(/\t/, " ", s)
+        sub(/^[[:space:]]+/, "", s)
+        sub(/[[:space:]]+$/, "", s)
+        return (s == "") ? "-" : s
+    }
+    function emit(key, type, state, related, text) {
+        printf "%s\t%s\t%s\t%s\t%d\t%s\t%s\t%s\n", key, type, feature, FILENAME, FNR, state, clean(related), clean(text) > ids_out
+    }
+    function flush_terms(    t) {
+        for (t in terms) printf "%s\t%s\t%s\t%d\n", t, feature, path, terms[t] > terms_out
+        delete terms
+    }
+    function item_state(line) {
+        return (line ~ /^[[:space:]]*[-*] \[ \]/) ? "open" : "done"
+    }
+    FNR == 1 {
+        if (NR > 1) flush_terms()
+        path = FILENAME
+        feature = path
+        sub(/^specs\//, "", feature)
+        sub(/\/.*/, "", feature)
+        in_comment = 0
+        phase = "-"
+    }
+    {
+        line = $0
+
+        # Template guidance lives in HTML comments; it is not part of the artifact
+        if (in_comment) {
+            if (!index(line, "-->")) next
+            line = substr(line, index(line, "-->") + 3)
+            in_comment = 0
+        }
+        while ((start = index(line, "<!--")) > 0) {
+            rest = substr(line, start + 4)
+            if ((stop = index(rest, "-->")) > 0) {
+                line = substr(line, 1, start - 1) substr(rest, stop + 3)
+            } else {
+                line = substr(line, 1, start - 1)
+                in_comment = 1
+            }
+        }
+
+        if (line ~ /^## /) phase = substr(line, 4)
+        owner = "-"
+
+        if (match(line, /^[[:space:]]*[-*] \[[ xX]\] T[0-9]+/)) {
+            id = substr(line, RSTART, RLENGTH)
+            sub(/.*\] /, "", id)
+            owner = id
+            state = item_state(line)
+            text = substr(line, RSTART + RLENGTH)
+            emit(id, "task", state, phase, text)
+            rest = line
+            while (match(rest, /\[US[0-9]+\]/)) {
+                emit(substr(rest, RSTART + 1, RLENGTH - 2), "story-task", state, id, text)
+                rest = substr(rest, RSTART + RLENGTH)
+            }
+        } else if (match(line, /^[[:space:]]*[-*] \[[ xX]\] CHK[0-9]+/)) {
+            id = substr(line, RSTART, RLENGTH)
+            sub(/.*\] /, "", id)
+            owner = id
+            emit(id, "check", item_state(line), "-", substr(line, RSTART + RLENGTH))
+        } else if (match(line, /\*\*(FR|SC)-[0-9]+\*\*/)) {
+            id = substr(line, RSTART + 2, RLENGTH - 4)
+            owner = id
+            text = substr(line, RSTART + RLENGTH)
+            sub(/^:/, "", text)
+            emit(id, (id ~ /^FR/) ? "requirement" : "criterion", "-", "-", text)
+        } else if (match(line, /^#+[[:space:]]+User Story[[:space:]]+[0-9]+/)) {
+            number = substr(line, RSTART, RLENGTH)
+            sub(/.*[^0-9]/, "", number)
+            priority = "-"
+            if (match(line, /Priority:[[:space:]]*P[0-9]+/)) {
+                priority = substr(line, RSTART, RLENGTH)
+                sub(/.*[^P0-9]/, "", priority)
+            }
+            title = line
+            sub(/^#+[[:space:]]+User Story[[:space:]]+[0-9]+[[:space:]]*-?/, "", title)
+            sub(/\(Priority:.*$/, "", title)
+            emit("US" number, "story", "-", priority, title)
+        }
+
+        # Requirements and success criteria cited from anywhere else
+        rest = line
+        while (match(rest, /(FR|SC)-[0-9]+/)) {
+            id = substr(rest, RSTART, RLENGTH)
+            rest = substr(rest, RSTART + RLENGTH)
+            if (id != owner) emit(id, "ref", "-", owner, line)
+        }
+
+        if (index(line, "NEEDS CLARIFICATION")) emit("NEEDS-CLARIFICATION", "clarification", "-", owner, line)
+
+        text = tolower(line)
+        gsub(/[^a-z0-9_]+/, " ", text)
+        count = split(text, words, " ")
+        for (i = 1; i <= count; i++) {
+            if (length(words[i]) >= 3 && words[i] !~ /^[0-9]+$/) terms[words[i]]++
+        }
+    }
+    END { if (NR > 0) flush_terms() }' "$@"
+    trace_end $?
+}
+
+# Set SEGMENTS to the index segment directories, oldest first. Segment 0000 is
+# the base; each later segment holds the postings of the files re-parsed by one
+# refresh and lists in "paths" every file whose older postings it supersedes.
+list_segments() {
+    shopt -s nullglob
+    SEGMENTS=("$INDEX_DIR"/segments/[0-9][0-9][0-9][0-9])
+    shopt -u nullglob
+}
+
+# Awk rules shared by everything that reads postings: "paths" files (which must
+# come first) record the newest segment superseding each file, and postings
+# from older segments for those files are skipped. Needs -v pathcol=N.
+LIVE_POSTINGS='
+    function segment_of(name,    s) {
+        s = name
+        sub(/.*\/segments\//, "", s)
+        sub(/\/.*/, "", s)
+        return s + 0
+    }
+    FNR == 1 { segment = segment_of(FILENAME) }
+    FILENAME ~ /\/paths$/ { if (segment > superseded[$0]) superseded[$0] = segment; next }
+    superseded[$pathcol] > segment { next }
+'
+
+# Write the live postings of the given segment directories into sharded files
+# under $1. ID postings are sharded by ID prefix and last digit (see id_shard),
+# terms by first character, so a lookup reads one small shard per segment.
+write_segment() {
+    local out_dir="$1"
+    shift
+
+    local segment paths=() ids=() terms=()
+    shopt -s nullglob
+    for segment in "$@"; do
+        [[ -f "$segment/paths" ]] && paths+=("$segment/paths")
+        ids+=("$segment"/ids/*.tsv)
+        terms+=("$segment"/terms/*.tsv)
+        [[ -f "$segment/ids.new" ]] && ids+=("$segment/ids.new")
+        [[ -f "$segment/terms.new" ]] && terms+=("$segment/terms.new")
+    done
+    shopt -u nullglob
+
+    mkdir -p "$out_dir/ids" "$out_dir/terms"
+    trace_begin cmd "awk write-segment"
+    LC_ALL=C awk -F '\t' -v pathcol=4 -v out_dir="$out_dir/ids" "$LIVE_POSTINGS"'
+        function shard(key,    digit, prefix) {
+            digit = substr(key, length(key))
+            if (digit !~ /[0-9]/) digit = "_"
+            prefix = key
+            sub(/[0-9]+$/, "", prefix)
+            return prefix digit
+        }
+        { print > (out_dir "/" shard($1) ".tsv") }
+    ' "${paths[@]}" "${ids[@]}"
+    LC_ALL=C awk -F '\t' -v pathcol=3 -v out_dir="$out_dir/terms" "$LIVE_POSTINGS"'
+        { print > (out_dir "/" substr($1, 1, 1) ".tsv") }
+    ' "${paths[@]}" "${terms[@]}"
+    trace_end $? 2
+}
+
+# Bring the index up to date with specs/. Sets UPDATE_FILES, UPDATE_PARSED and
+# UPDATE_REMOVED.
+refresh_index() {
+    UPDATE_FILES=0
+    UPDATE_PARSED=0
+    UPDATE_REMOVED=0
+
+    mkdir -p "$INDEX_DIR/segments"
+    trace_call lock_index
+
+    # Another process may have refreshed the index while we waited
+    if index_is_fresh; then
+        unlock_index
+        return 0
+    fi
+
+    trace_begin phase refresh-index
+    WORK_DIR=$(trace_cmd mktemp -d)
+    [[ -f "$INDEX_DIR/files.tsv" ]] || : > "$INDEX_DIR/files.tsv"
+
+    # Anything modified after this point is newer than the stamp we install
+    : > "$INDEX_DIR/stamp.new"
+
+    local files=()
+    shopt -s nullglob
+    [[ -d specs ]] && files=(specs/*/*.md specs/*/checklists/*.md)
+    shopt -u nullglob
+    UPDATE_FILES=${#files[@]}
+
+    # Files touched within the current second are recorded with mtime 0, since a
+    # later change in the same second (such as ticking a task) would keep both
+    # mtime and size; they are checksummed again on the next refresh
+    local now
+    printf -v now '%(%s)T' -1
+
+    # Classify files as unchanged, changed (mtime or size differs) or removed
+    stat_files "${files[@]}" > "$WORK_DIR/stat"
+    trace_begin cmd "awk classify"
+    LC_ALL=C awk -F '\t' -v plan="$WORK_DIR/plan" '
+        FILENAME != "-" { known[$1] = $2 "\t" $3; hash[$1] = $4; next }
+        {
+            split($0, fields, " ")
+            mtime = fields[1]; size = fields[2]
+            sub(/^[^ ]+ [^ ]+ /, "")
+            seen[$0] = 1
+            if (known[$0] == mtime "\t" size) {
+                print "keep\t" $0 "\t" mtime "\t" size "\t" hash[$0] > plan
+            } else {
+                print "check\t" $0 "\t" mtime "\t" size "\t" hash[$0] > plan
+            }
+        }
+        END { for (p in known) if (!(p in seen)) print "removed\t" p > plan }
+    ' "$INDEX_DIR/files.tsv" - < "$WORK_DIR/stat"
+    trace_end $?
+
+    # Files whose content hash is unchanged only need their mtime refreshed
+    local check=()
+    mapfile -t check < <(LC_ALL=C awk -F '\t' '$1 == "check" { print $2 }' "$WORK_DIR/plan")
+    : > "$WORK_DIR/cksum"
+    if [[ ${#check[@]} -gt 0 ]]; then
+        trace_cmd cksum -- "${check[@]}" > "$WORK_DIR/cksum"
+    fi
+
+    trace_begin cmd "awk plan"
+    LC_ALL=C awk -F '\t' -v now="$now" -v files_out="$WORK_DIR/files.tsv" -v parse_out="$WORK_DIR/parse" -v drop_out="$WORK_DIR/drop" '
+        FILENAME != "-" {
+            crc = $0
+            sub(/ .*/, "", crc)
+            path = $0
+            sub(/^[^ ]+ [^ ]+ /, "", path)
+            sums[path] = crc
+            next
+        }
+        $1 == "removed" { print $2 > drop_out; next }
+        $1 == "check" {
+            if ($5 == "" || sums[$2] != $5) {
+                print $2 > parse_out
+                print $2 > drop_out
+            }
+            $5 = sums[$2]
+        }
+        $3 + 0 >= now + 0 { $3 = 0 }
+        { print $2 "\t" $3 "\t" $4 "\t" $5 > files_out }
+    ' "$WORK_DIR/cksum" - < "$WORK_DIR/plan"
+    trace_end $?
+
+    local parse=() removed=0
+    [[ -f "$WORK_DIR/parse" ]] && mapfile -t parse < "$WORK_DIR/parse"
+    [[ -f "$WORK_DIR/drop" ]] && removed=$(( $(LC_ALL=C awk 'END { print NR }' "$WORK_DIR/drop") - ${#parse[@]} ))
+    UPDATE_PARSED=${#parse[@]}
+    UPDATE_REMOVED=$removed
+
+    if [[ -f "$WORK_DIR/drop" ]]; then
+        list_segments
+        local last=-1
+        [[ ${#SEGMENTS[@]} -gt 0 ]] && last=$((10#${SEGMENTS[-1]##*/}))
+
+        # Stage the new segment: postings of re-parsed files plus the paths
+        # whose older postings it supersedes
+        local stage
+        printf -v stage '%s/segments/%04d' "$WORK_DIR" $((last + 1))
+        mkdir -p "$stage"
+        mv "$WORK_DIR/drop" "$stage/paths"
+        parse_files "$stage/ids.new" "$stage/terms.new" "${parse[@]}"
+
+        # Fold everything into a fresh base once segments pile up or most of the
+        # tree changed; otherwise just add the small segment
+        if [[ ${#SEGMENTS[@]} -eq 0 || ${#SEGMENTS[@]} -gt $MAX_SEGMENTS || $((UPDATE_PARSED * 4)) -ge $UPDATE_FILES ]]; then
+            write_segment "$WORK_DIR/base" "${SEGMENTS[@]}" "$stage"
+            rm -rf "$INDEX_DIR/segments"
+            mkdir -p "$INDEX_DIR/segments"
+            mv "$WORK_DIR/base" "$INDEX_DIR/segments/0000"
+        else
+            write_segment "$stage" "$stage"
+            rm -f "$stage/ids.new" "$stage/terms.new"
+            mv "$stage" "$INDEX_DIR/segments/"
+        fi
+    fi
+
+    [[ -f "$WORK_DIR/files.tsv" ]] || : > "$WORK_DIR/files.tsv"
+    mv -f "$WORK_DIR/files.tsv" "$INDEX_DIR/files.tsv"
+    mv -f "$INDEX_DIR/stamp.new" "$INDEX_DIR/stamp"
+
+    rm -rf "$WORK_DIR"
+    WORK_DIR=""
+    unlock_index
+    trace_end
+}
+
+#==============================================================================
+# Queries
+#==============================================================================
+
+# Set ID_SHARD to the shard holding an ID's postings: its prefix plus its last
+# digit (FR-006 -> FR-6, T123 -> T3, NEEDS-CLARIFICATION -> NEEDS-CLARIFICATION_)
+id_shard() {
+    local key="$1"
+    local digits="${key##*[!0-9]}"
+    local last="${key: -1}"
+    [[ "$last" == [0-9] ]] || last="_"
+    ID_SHARD="${key%"$digits"}$last"
+}
+
+# Set SHARD_FILES to every segment's "paths" list followed by the existing ID
+# shards matching the given glob patterns, ready for the LIVE_POSTINGS rules
+find_id_shards() {
+    local pattern segment shard shards=()
+    list_segments
+    SHARD_FILES=()
+    shopt -s nullglob
+    for segment in "${SEGMENTS[@]}"; do
+        [[ -f "$segment/paths" ]] && SHARD_FILES+=("$segment/paths")
+        for pattern in "$@"; do
+            # A pattern without wildcards survives nullglob, so test each match
+            for shard in "$segment"/ids/$pattern.tsv; do
+                [[ -f "$shard" ]] && shards+=("$shard")
+            done
+        done
+    done
+    shopt -u nullglob
+    [[ ${#shards[@]} -gt 0 ]] || { SHARD_FILES=(); return 0; }
+    SHARD_FILES+=("${shards[@]}")
+}
+
+# Print postings from SHARD_FILES selected by the awk condition in $1, with
+# "name=value" in $2 available to the condition, filtered by --feature
+print_postings() {
+    local condition="$1"
+    local variable="${2:-_=}"
+
+    [[ ${#SHARD_FILES[@]} -gt 0 ]] || return 0
+    LC_ALL=C awk -F '\t' -v pathcol=4 -v json="$JSON_MODE" -v feature="$FEATURE_FILTER" -v "$variable" "$LIVE_POSTINGS"'
+        function escape(s) { gsub(/\\/, "\\\\", s); gsub(/"/, "\\\"", s); return s }
+        feature != "" && $3 != feature && index($3, feature "-") != 1 { next }
+        '"$condition"' {
+            if (json == "true") {
+                printf "{\"ID\":\"%s\",\"TYPE\":\"%s\",\"FEATURE\":\"%s\",\"PATH\":\"%s\",\"LINE\":%d,\"STATE\":\"%s\",\"RELATED\":\"%s\",\"TEXT\":\"%s\"}\n", \
+                    escape($1), $2, escape($3), escape($4), $5, $6, escape($7), escape($8)
+            } else {
+                printf "%s:%d\t%s\t%s\t%s\t%s\t%s\n", $4, $5, $1, $2, $6, $7, $8
+            }
+        }
+    ' "${SHARD_FILES[@]}"
+}
+
+query_ids() {
+    local keys="" key
+    local -A shards=()
+    for key in "$@"; do
+        key="${key^^}"
+        keys+="$key "
+        # IDs sharing a shard must read it only once, or postings print twice
+        id_shard "$key"
+        shards["$ID_SHARD"]=1
+    done
+    find_id_shards "${!shards[@]}"
+    print_postings 'index(" " keys, " " $1 " ")' "keys=$keys"
+}
+
+query_story() {
+    local story="${1^^}"
+    id_shard "$story"
+    find_id_shards "$ID_SHARD"
+    print_postings '$1 == story && $2 == "story-task"' "story=$story"
+}
+
+query_file() {
+    local path="$1"
+    path="${path#"$REPO_ROOT"/}"
+    path="${path#./}"
+    find_id_shards "*"
+    print_postings '$4 == path' "path=$path"
+}
+
+query_clarifications() {
+    find_id_shards "NEEDS-CLARIFICATION_"
+    [[ ${#SHARD_FILES[@]} -gt 0 ]] || return 0
+    LC_ALL=C awk -F '\t' -v pathcol=4 -v json="$JSON_MODE" -v feature="$FEATURE_FILTER" "$LIVE_POSTINGS"'
+        function escape(s) { gsub(/\\/, "\\\\", s); gsub(/"/, "\\\"", s); return s }
+        $2 != "clarification" { next }
+        feature != "" && $3 != feature && index($3, feature "-") != 1 { next }
+        {
+            if (!($3 in count)) order[++features] = $3
+            count[$3]++
+            where[$3] = where[$3] (count[$3] > 1 ? "\t" : "") $4 ":" $5
+        }
+        END {
+            for (i = 1; i <= features; i++) {
+                name = order[i]
+                n = split(where[name], locations, "\t")
+                if (json == "true") {
+                    list = ""
+                    for (j = 1; j <= n; j++) list = list (j > 1 ? "," : "") "\"" escape(locations[j]) "\""
+                    printf "{\"FEATURE\":\"%s\",\"COUNT\":%d,\"LOCATIONS\":[%s]}\n", escape(name), count[name], list
+                } else {
+                    printf "%s\t%d\t%s\n", name, count[name], locations[1] (n > 1 ? " (+" (n - 1) " more)" : "")
+                }
+            }
+        }
+    ' "${SHARD_FILES[@]}"
+}
+
+query_terms() {
+    local words=() paths=() shards=() word shard
+    for word in "$@"; do
+        word="${word,,}"
+        if [[ ! "$word" =~ ^[a-z0-9_]{3,}\*?$ ]]; then
+            echo "ERROR: Terms are indexed as words of three or more letters, digits or '_': '$word'" >&2
+            exit 1
+        fi
+        words+=("$word")
+    done
+
+    # One shard per distinct first character, from every segment
+    local segment
+    list_segments
+    shopt -s nullglob
+    for segment in "${SEGMENTS[@]}"; do
+        [[ -f "$segment/paths" ]] && paths+=("$segment/paths")
+        for word in "${words[@]}"; do
+            shard="$segment/terms/${word:0:1}.tsv"
+            [[ -f "$shard" ]] || continue
+            [[ " ${shards[*]} " == *" $shard "* ]] || shards+=("$shard")
+        done
+    done
+    shopt -u nullglob
+    [[ ${#shards[@]} -gt 0 ]] || return 0
+
+    LC_ALL=C awk -F '\t' -v pathcol=3 -v words="${words[*]}" -v feature="$FEATURE_FILTER" "$LIVE_POSTINGS"'
+        BEGIN { wanted = split(words, list, " ") }
+        feature != "" && $2 != feature && index($2, feature "-") != 1 { next }
+        {
+            for (i = 1; i <= wanted; i++) {
+                w = list[i]
+                if (w ~ /\*$/ ? index($1, substr(w, 1, length(w) - 1)) == 1 : $1 == w) {
+                    if (!(($3, i) in hit)) { hit[$3, i] = 1; matched[$3]++ }
+                    score[$3] += $4
+                    where[$3] = $2
+                }
+            }
+        }
+        END { for (p in matched) if (matched[p] == wanted) printf "%d\t%s\t%s\n", score[p], where[p], p }
+    ' "${paths[@]}" "${shards[@]}" | LC_ALL=C sort -t $'\t' -k1,1nr -k3,3 | LC_ALL=C awk -F '\t' -v json="$JSON_MODE" '
+        function escape(s) { gsub(/\\/, "\\\\", s); gsub(/"/, "\\\"", s); return s }
+        {
+            if (json == "true") {
+                printf "{\"PATH\":\"%s\",\"FEATURE\":\"%s\",\"SCORE\":%d}\n", escape($3), escape($2), $1
+            } else {
+                printf "%s\t%d\n", $3, $1
+            }
+        }
+    '
+}
+
+# Report traceability gaps from the index alone; returns 1 if any were found.
+# Requirements, their references, tasks and stories all live in the FR-, T and
+# US shards, so the other shards are never read.
+check_traceability() {
+    find_id_shards "FR-[0-9]" "T[0-9]" "US[0-9]"
+    [[ ${#SHARD_FILES[@]} -gt 0 ]] || return 0
+    LC_ALL=C awk -F '\t' -v pathcol=4 -v json="$JSON_MODE" -v feature="$FEATURE_FILTER" "$LIVE_POSTINGS"'
+        function escape(s) { gsub(/\\/, "\\\\", s); gsub(/"/, "\\\"", s); return s }
+        function gap(name, check, id, where,    parts) {
+            split(where, parts, "\t")
+            gaps++
+            if (json == "true") {
+                printf "{\"FEATURE\":\"%s\",\"CHECK\":\"%s\",\"ID\":\"%s\",\"PATH\":\"%s\",\"LINE\":%d}\n", \
+                    escape(name), check, escape(id), escape(parts[1]), parts[2]
+            } else {
+                printf "%s\t%s\t%s\t%s:%d\n", name, check, id, parts[1], parts[2]
+            }
+        }
+        feature != "" && $3 != feature && index($3, feature "-") != 1 { next }
+        {
+            key = $3 SUBSEP $1
+            where = $4 "\t" $5
+        }
+        $2 == "requirement" && $1 ~ /^FR-/ && $4 ~ /\/spec\.md$/ {
+            if (!(key in requirement)) { requirement[key] = where; order[++items] = "requirement" SUBSEP key }
+        }
+        $2 == "ref" && $7 ~ /^T[0-9]+$/ { covered[key] = 1 }
+        $2 == "task" {
+            has_tasks[$3] = 1
+            if (!(key in task)) { task[key] = where; phase[key] = $7; order[++items] = "task" SUBSEP key }
+        }
+        $2 == "story" && $4 ~ /\/spec\.md$/ {
+            if (!(key in story)) { story[key] = where; order[++items] = "story" SUBSEP key }
+        }
+        $2 == "story-task" {
+            tagged[$3 SUBSEP $7] = 1
+            story_tasks[key] = 1
+            if (!(key in tag)) { tag[key] = where; order[++items] = "tag" SUBSEP key }
+        }
+        END {
+            for (i = 1; i <= items; i++) {
+                split(order[i], parts, SUBSEP)
+                kind = parts[1]; name = parts[2]; id = parts[3]
+                key = name SUBSEP id
+                if (!(name in has_tasks)) continue
+                if (kind == "requirement" && !(key in covered)) {
+                    gap(name, "requirement-without-task", id, requirement[key])
+                } else if (kind == "task" && !(key in tagged) && tolower(phase[key]) !~ /setup|foundational|polish/) {
+                    gap(name, "task-without-story", id, task[key])
+                } else if (kind == "tag" && !(key in story)) {
+                    gap(name, "unknown-story", id, tag[key])
+                } else if (kind == "story" && !(key in story_tasks)) {
+                    gap(name, "story-without-task", id, story[key])
+                }
+            }
+            exit (gaps > 0)
+        }
+    ' "${SHARD_FILES[@]}"
+}
+
+#==============================================================================
+# Main Execution
+#==============================================================================
+
+if [[ "$COMMAND" == "rebuild" ]]; then
+    rm -rf "$INDEX_DIR"
+fi
+
+if $REFRESH || [[ "$COMMAND" == "update" || "$COMMAND" == "rebuild" ]] || ! [[ -f "$INDEX_DIR/files.tsv" ]]; then
+    UPDATE_FILES=0
+    UPDATE_PARSED=0
+    UPDATE_REMOVED=0
+    # Queries trust the stamp; explicit updates always compare every file
+    if [[ "$COMMAND" == "update" || "$COMMAND" == "rebuild" ]] || ! index_is_fresh; then
+        [[ "$COMMAND" == "update" ]] && rm -f "$INDEX_DIR/stamp"
+        refresh_index
+    fi
+fi
+
+trace_begin phase query
+case "$COMMAND" in
+    update|rebuild)
+        list_segments
+        if $JSON_MODE; then
+            printf '{"INDEX_DIR":"%s","FILES":%d,"PARSED":%d,"REMOVED":%d,"SEGMENTS":%d}\n' \
+                "$INDEX_DIR" "$UPDATE_FILES" "$UPDATE_PARSED" "$UPDATE_REMOVED" "${#SEGMENTS[@]}"
+        else
+            echo "INDEX_DIR: $INDEX_DIR"
+            echo "FILES: $UPDATE_FILES"
+            echo "PARSED: $UPDATE_PARSED"
+            echo "REMOVED: $UPDATE_REMOVED"
+            echo "SEGMENTS: ${#SEGMENTS[@]}"
+        fi
+        ;;
+    id)
+        query_ids "${ARGS[@]}"
+        ;;
+    story)
+        query_story "${ARGS[0]}"
+        ;;
+    file)
+        query_file "${ARGS[0]}"
+        ;;
+    clarifications)
+        query_clarifications
+        ;;
+    term)
+        query_terms "${ARGS[@]}"
+        ;;
+    trace)
+        status=0
+        check_traceability || status=$?
+        trace_end "$status"
+        exit "$status"
+        ;;
+esac
+trace_end
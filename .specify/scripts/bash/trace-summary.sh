@@ -0,0 +1,257 @@
+#!/usr/bin/env bash
+
+# Summarise SPECIFY_TRACE output into a hot-path report
+#
+# Every script records timing spans when SPECIFY_TRACE is set, for example:
+#
+#   SPECIFY_TRACE=/tmp/trace.jsonl .specify/scripts/bash/update-agent-context.sh
+#
+# Each line is one completed span (phase, function or external command) with its
+# duration, exit status and the number of processes it forked. This script
+# aggregates one or more trace files, across any number of runs, and reports the
+# phases, commands and functions that cost the most.
+#
+# Usage: ./trace-summary.sh [OPTIONS] [TRACE_FILE...]
+#
+# OPTIONS:
+#   --top N             Rows per section (default: 10)
+#   --sort KEY          Order rows by "time" (default) or "forks"
+#   --json              Output in JSON format
+#   --help, -h          Show help message
+#
+# With no TRACE_FILE the file named by SPECIFY_TRACE is used (or
+# ${TMPDIR:-/tmp}/specify-trace.jsonl when SPECIFY_TRACE is unset or 1).
+#
+# OUTPUTS:
+#   Text mode: one table per section (phases, commands, functions, scripts)
+#   JSON mode: {"RUNS":N,"SPANS":N,"PHASES":[...],"COMMANDS":[...],"FUNCTIONS":[...],"SCRIPTS":[...]}
+#              where each row has NAME, COUNT, TOTAL_MS, AVG_MS, PER_RUN_MS, FORKS and FAILURES
+#              (script rows have NAME, SPANS, FORKS and FORKS_PER_RUN)
+
+set -e
+
+JSON_MODE=false
+TOP=10
+SORT_KEY="time"
+EXPECT=""
+TRACE_FILES=()
+
+for arg in "$@"; do
+    case "$EXPECT" in
+        top)
+            if [[ ! "$arg" =~ ^[1-9][0-9]*$ ]]; then
+                echo "ERROR: --top requires a positive integer" >&2
+                exit 1
+            fi
+            TOP="$arg"
+            EXPECT=""
+            continue
+            ;;
+        sort)
+            if [[ "$arg" != "time" && "$arg" != "forks" ]]; then
+                echo "ERROR: --sort must be 'time' or 'forks'" >&2
+                exit 1
+            fi
+            SORT_KEY="$arg"
+            EXPECT=""
+            continue
+            ;;
+    esac
+
+    case "$arg" in
+        --json)
+            JSON_MODE=true
+            ;;
+        --top)
+            EXPECT="top"
+            ;;
+        --sort)
+            EXPECT="sort"
+            ;;
+        --help|-h)
+            cat << 'EOF'
+Usage: trace-summary.sh [OPTIONS] [TRACE_FILE...]
+
+Aggregate SPECIFY_TRACE output into a hot-path report.
+
+OPTIONS:
+  --top N             Rows per section (default: 10)
+  --sort KEY          Order rows by "time" (default) or "forks"
+  --json              Output in JSON format
+  --help, -h          Show this help message
+
+With no TRACE_FILE the file named by SPECIFY_TRACE is used
+(or ${TMPDIR:-/tmp}/specify-trace.jsonl when SPECIFY_TRACE is unset or 1).
+
+EXAMPLES:
+  # Trace a few runs, then find where the time goes
+  export SPECIFY_TRACE=/tmp/trace.jsonl
+  .specify/scripts/bash/check-prerequisites.sh --json
+  .specify/scripts/bash/update-agent-context.sh claude
+  ./trace-summary.sh /tmp/trace.jsonl
+
+  # Which phases spawn the most processes?
+  ./trace-summary.sh --sort forks --top 5
+
+EOF
+            exit 0
+            ;;
+        -*)
+            echo "ERROR: Unknown option '$arg'. Use --help for usage information." >&2
+            exit 1
+            ;;
+        *)
+            TRACE_FILES+=("$arg")
+            ;;
+    esac
+done
+
+if [[ -n "$EXPECT" ]]; then
+    echo "ERROR: --$EXPECT requires a value" >&2
+    exit 1
+fi
+
+if [[ ${#TRACE_FILES[@]} -eq 0 ]]; then
+    case "${SPECIFY_TRACE:-}" in
+        ""|0|1|false|true) TRACE_FILES=("${TMPDIR:-/tmp}/specify-trace.jsonl") ;;
+        *) TRACE_FILES=("$SPECIFY_TRACE") ;;
+    esac
+fi
+
+for file in "${TRACE_FILES[@]}"; do
+    if [[ ! -f "$file" ]]; then
+        echo "ERROR: Trace file not found: $file" >&2
+        echo "Run a script with SPECIFY_TRACE set to record one." >&2
+        exit 1
+    fi
+done
+
+# Aggregate spans into "section<TAB>total_us<TAB>count<TAB>forks<TAB>failures<TAB>name"
+# rows plus a "runs" and "spans" row. Phase forks include every span recorded
+# inside the phase; script rows cover every span a script recorded.
+aggregate() {
+    awk '
+    function field(line, key,    pattern, value) {
+        pattern = "\"" key "\":\"([^\"\\\\]|\\\\.)*\""
+        if (match(line, pattern)) {
+            value = substr(line, RSTART + length(key) + 4, RLENGTH - length(key) - 5)
+            gsub(/\\"/, "\"", value)
+            gsub(/\\\\/, "\\", value)
+            return value
+        }
+        pattern = "\"" key "\":-?[0-9]+"
+        if (match(line, pattern)) {
+            return substr(line, RSTART + length(key) + 3, RLENGTH - length(key) - 3)
+        }
+        return ""
+    }
+    function add(section, name, dur, forks, failed,    key) {
+        key = section SUBSEP name
+        total[key] += dur
+        count[key]++
+        nforks[key] += forks
+        failures[key] += failed
+    }
+    /^\{/ {
+        kind = field($0, "kind")
+        name = field($0, "name")
+        phase = field($0, "phase")
+        dur = field($0, "dur_us") + 0
+        forks = field($0, "forks") + 0
+        failed = (field($0, "status") + 0 != 0)
+
+        spans++
+        runs[field($0, "run")] = 1
+
+        if (kind == "phase") {
+            add("phases", name, dur, 0, failed)
+        } else if (kind == "cmd") {
+            add("commands", name, dur, forks, failed)
+        } else {
+            add("functions", name, dur, forks, failed)
+        }
+        if (phase != "") {
+            phase_forks[phase] += forks
+        }
+        add("scripts", field($0, "script"), 0, forks, 0)
+    }
+    END {
+        nruns = 0
+        for (r in runs) nruns++
+        printf "runs\t%d\n", nruns
+        printf "spans\t%d\n", spans + 0
+        for (key in total) {
+            split(key, parts, SUBSEP)
+            forks = nforks[key]
+            if (parts[1] == "phases") forks = phase_forks[parts[2]] + 0
+            printf "%s\t%d\t%d\t%d\t%d\t%s\n", parts[1], total[key], count[key], forks, failures[key], parts[2]
+        }
+    }' "$@"
+}
+
+if [[ "$SORT_KEY" == "forks" ]]; then
+    SORT_ARGS=(-k1,1 -k4,4nr -k2,2nr)
+else
+    SORT_ARGS=(-k1,1 -k2,2nr -k4,4nr)
+fi
+
+aggregate "${TRACE_FILES[@]}" | LC_ALL=C sort -t $'\t' "${SORT_ARGS[@]}" | awk -F '\t' -v top="$TOP" -v json="$JSON_MODE" '
+    function ms(us) { return sprintf("%.3f", us / 1000) }
+    function escape(s) { gsub(/\\/, "\\\\", s); gsub(/"/, "\\\"", s); return s }
+    $1 == "runs" { runs = $2; next }
+    $1 == "spans" { spans = $2; next }
+    {
+        if (++shown[$1] > top) next
+        n = ++rows[$1]
+        name[$1, n] = $6
+        total[$1, n] = $2
+        count[$1, n] = $3
+        forks[$1, n] = $4
+        failures[$1, n] = $5
+    }
+    END {
+        split("phases commands functions scripts", order, " ")
+        split("PHASES COMMANDS FUNCTIONS SCRIPTS", keys, " ")
+        split("Phases|Commands|Functions|Scripts", titles, "|")
+        per = (runs > 0) ? runs : 1
+
+        if (json == "true") {
+            printf "{\"RUNS\":%d,\"SPANS\":%d", runs, spans
+            for (s = 1; s <= 4; s++) {
+                printf ",\"%s\":[", keys[s]
+                for (i = 1; i <= rows[order[s]]; i++) {
+                    sec = order[s]
+                    if (sec == "scripts") {
+                        printf "%s{\"NAME\":\"%s\",\"SPANS\":%d,\"FORKS\":%d,\"FORKS_PER_RUN\":%.1f}", \
+                            (i > 1 ? "," : ""), escape(name[sec, i]), count[sec, i], forks[sec, i], forks[sec, i] / per
+                        continue
+                    }
+                    printf "%s{\"NAME\":\"%s\",\"COUNT\":%d,\"TOTAL_MS\":%s,\"AVG_MS\":%s,\"PER_RUN_MS\":%s,\"FORKS\":%d,\"FAILURES\":%d}", \
+                        (i > 1 ? "," : ""), escape(name[sec, i]), count[sec, i], ms(total[sec, i]), \
+                        ms(total[sec, i] / count[sec, i]), ms(total[sec, i] / per), forks[sec, i], failures[sec, i]
+                }
+                printf "]"
+            }
+            printf "}\n"
+            exit
+        }
+
+        printf "RUNS: %d\nSPANS: %d\n", runs, spans
+        for (s = 1; s <= 4; s++) {
+            sec = order[s]
+            if (rows[sec] == 0) continue
+            printf "\n%s\n", titles[s]
+            if (sec == "scripts") {
+                printf "  %8s %8s %10s  %s\n", "SPANS", "FORKS", "FORKS/RUN", "NAME"
+                for (i = 1; i <= rows[sec]; i++) {
+                    printf "  %8d %8d %10.1f  %s\n", count[sec, i], forks[sec, i], forks[sec, i] / per, name[sec, i]
+                }
+                continue
+            }
+            printf "  %10s %10s %10s %7s %7s %5s  %s\n", "TOTAL_MS", "AVG_MS", "PER_RUN", "COUNT", "FORKS", "FAIL", "NAME"
+            for (i = 1; i <= rows[sec]; i++) {
+                printf "  %10s %10s %10s %7d %7d %5d  %s\n", ms(total[sec, i]), ms(total[sec, i] / count[sec, i]), \
+                    ms(total[sec, i] / per), count[sec, i], forks[sec, i], failures[sec, i], name[sec, i]
+            }
+        }
+    }'
@@ -36,7 +36,9 @@
 #
 # Usage: ./update-agent-context.sh [agent_type]
 # Agent types: claude|gemini|copilot|cursor-agent|qwen|opencode|codex|windsurf|kilocode|auggie|shai|q|bob|qoder
-# Leave empty to update all existing agent files
+# Leave empty to update all existing agent files. In that mode the plan is parsed
+# once, agents sharing a file (e.g. AGENTS.md) are grouped by resolved path, and
+# each distinct file is rewritten exactly once, in parallel.
 
 set -e
 
@@ -85,6 +87,28 @@ NEW_FRAMEWORK=""
 NEW_DB=""
 NEW_PROJECT_TYPE=""
 
+# Entries derived from the parsed plan, built once and shared by every target
+NEW_TECH_STACK=""
+NEW_CHANGE_ENTRY=""
+
+# Distinct target files (resolved paths) and the agents sharing each one
+AGENT_TARGET_PATHS=()
+AGENT_TARGET_NAMES=()
+
+# Lines of the agent file being patched, the patched result, and whether it was written
+AGENT_FILE_LINES=()
+AGENT_FILE_OUT=()
+AGENT_FILE_CHANGED=false
+
+# Scratch directory holding per-target logs during parallel updates
+AGENT_LOG_DIR=""
+
+# Temporary files created next to agent files; removed by cleanup if a run is
+# interrupted. Parallel updates run in subshells, so each also lists its paths
+# in AGENT_TEMP_LIST for the parent to find.
+AGENT_TEMP_FILES=()
+AGENT_TEMP_LIST=""
+
 #==============================================================================
 # Utility Functions
 #==============================================================================
@@ -108,14 +132,32 @@ log_warning() {
 # Cleanup function for temporary files
 cleanup() {
     local exit_code=$?
-    rm -f /tmp/agent_update_*_$$
-    rm -f /tmp/manual_additions_$$
+    local list temp_file
+    if [[ -n "$AGENT_LOG_DIR" ]]; then
+        for list in "$AGENT_LOG_DIR"/*.tmp; do
+            [[ -f "$list" ]] && mapfile -t -O ${#AGENT_TEMP_FILES[@]} AGENT_TEMP_FILES < "$list"
+        done
+    fi
+    for temp_file in "${AGENT_TEMP_FILES[@]}"; do
+        rm -f "$temp_file" "$temp_file.bak" "$temp_file.bak2"
+    done
+    [[ -n "$AGENT_LOG_DIR" ]] && rm -rf "$AGENT_LOG_DIR"
     exit $exit_code
 }
 
 # Set up cleanup trap
 trap cleanup EXIT INT TERM
 
+# Create a temporary file next to $1 (so the final rename is atomic) and record
+# it for cleanup; sets AGENT_TEMP_FILE
+make_agent_temp_file() {
+    AGENT_TEMP_FILE=$(trace_cmd mktemp "$1.XXXXXX") || return 1
+    AGENT_TEMP_FILES+=("$AGENT_TEMP_FILE")
+    if [[ -n "$AGENT_TEMP_LIST" ]]; then
+        printf '%s\n' "$AGENT_TEMP_FILE" >> "$AGENT_TEMP_LIST"
+    fi
+}
+
 #==============================================================================
 # Validation Functions
 #==============================================================================
@@ -157,12 +199,14 @@ extract_plan_field() {
     local field_pattern="$1"
     local plan_file="$2"
     
+    trace_begin cmd "grep|head|sed|sed|grep|grep"
     grep "^\*\*${field_pattern}\*\*: " "$plan_file" 2>/dev/null | \
         head -1 | \
         sed "s|^\*\*${field_pattern}\*\*: ||" | \
         sed 's/^[ \t]*//;s/[ \t]*$//' | \
         grep -v "NEEDS CLARIFICATION" | \
         grep -v "^N/A$" || echo ""
+    trace_end 0 6
 }
 
 parse_plan_data() {
@@ -180,10 +224,10 @@ parse_plan_data() {
     
     log_info "Parsing plan data from $plan_file"
     
-    NEW_LANG=$(extract_plan_field "Language/Version" "$plan_file")
-    NEW_FRAMEWORK=$(extract_plan_field "Primary Dependencies" "$plan_file")
-    NEW_DB=$(extract_plan_field "Storage" "$plan_file")
-    NEW_PROJECT_TYPE=$(extract_plan_field "Project Type" "$plan_file")
+    NEW_LANG=$(trace_call extract_plan_field "Language/Version" "$plan_file")
+    NEW_FRAMEWORK=$(trace_call extract_plan_field "Primary Dependencies" "$plan_file")
+    NEW_DB=$(trace_call extract_plan_field "Storage" "$plan_file")
+    NEW_PROJECT_TYPE=$(trace_call extract_plan_field "Project Type" "$plan_file")
     
     # Log what we found
     if [[ -n "$NEW_LANG" ]]; then
@@ -205,6 +249,19 @@ parse_plan_data() {
     fi
 }
 
+# Build the tech stack and change entries once so every target reuses them
+prepare_update_entries() {
+    NEW_TECH_STACK=$(trace_call format_technology_stack "$NEW_LANG" "$NEW_FRAMEWORK")
+
+    if [[ -n "$NEW_TECH_STACK" ]]; then
+        NEW_CHANGE_ENTRY="- $CURRENT_BRANCH: Added $NEW_TECH_STACK"
+    elif [[ -n "$NEW_DB" ]] && [[ "$NEW_DB" != "N/A" ]] && [[ "$NEW_DB" != "NEEDS CLARIFICATION" ]]; then
+        NEW_CHANGE_ENTRY="- $CURRENT_BRANCH: Added $NEW_DB"
+    else
+        NEW_CHANGE_ENTRY=""
+    fi
+}
+
 format_technology_stack() {
     local lang="$1"
     local framework="$2"
@@ -285,26 +342,28 @@ create_new_agent_file() {
     
     log_info "Creating new agent context file from template..."
     
-    if ! cp "$TEMPLATE_FILE" "$temp_file"; then
+    if ! trace_cmd cp "$TEMPLATE_FILE" "$temp_file"; then
         log_error "Failed to copy template file"
         return 1
     fi
     
     # Replace template placeholders
     local project_structure
-    project_structure=$(get_project_structure "$NEW_PROJECT_TYPE")
+    project_structure=$(trace_call get_project_structure "$NEW_PROJECT_TYPE")
     
     local commands
-    commands=$(get_commands_for_language "$NEW_LANG")
+    commands=$(trace_call get_commands_for_language "$NEW_LANG")
     
     local language_conventions
-    language_conventions=$(get_language_conventions "$NEW_LANG")
+    language_conventions=$(trace_call get_language_conventions "$NEW_LANG")
     
     # Perform substitutions with error checking using safer approach
     # Escape special characters for sed by using a different delimiter or escaping
+    trace_begin cmd "sed escape"
     local escaped_lang=$(printf '%s\n' "$NEW_LANG" | sed 's/[\[\.*^$()+{}|]/\\&/g')
     local escaped_framework=$(printf '%s\n' "$NEW_FRAMEWORK" | sed 's/[\[\.*^$()+{}|]/\\&/g')
     local escaped_branch=$(printf '%s\n' "$CURRENT_BRANCH" | sed 's/[\[\.*^$()+{}|]/\\&/g')
+    trace_end 0 9
     
     # Build technology stack and recent change strings conditionally
     local tech_stack
@@ -340,7 +399,7 @@ create_new_agent_file() {
     )
     
     for substitution in "${substitutions[@]}"; do
-        if ! sed -i.bak -e "$substitution" "$temp_file"; then
+        if ! trace_cmd sed -i.bak -e "$substitution" "$temp_file"; then
             log_error "Failed to perform substitution: $substitution"
             rm -f "$temp_file" "$temp_file.bak"
             return 1
@@ -349,10 +408,10 @@ create_new_agent_file() {
     
     # Convert \n sequences to actual newlines
     newline=$(printf '\n')
-    sed -i.bak2 "s/\\\\n/${newline}/g" "$temp_file"
+    trace_cmd sed -i.bak2 "s/\\\\n/${newline}/g" "$temp_file"
     
     # Clean up backup files
-    rm -f "$temp_file.bak" "$temp_file.bak2"
+    trace_cmd rm -f "$temp_file.bak" "$temp_file.bak2"
     
     return 0
 }
@@ -360,144 +419,172 @@ create_new_agent_file() {
 
 
 
+# Build AGENT_FILE_OUT from AGENT_FILE_LINES by splicing new entries into the
+# Active Technologies and Recent Changes sections (a start of -1 means the section
+# is missing and is appended). Change entries past KEEP_CHANGES are dropped up to
+# TRIM_END; everything else is copied through as whole slices.
+# Usage: splice_agent_file TECH_START TECH_INSERT CHANGES_START TRIM_END KEEP_CHANGES CHANGE_ENTRY [TECH_ENTRY...]
+splice_agent_file() {
+    local tech_start="$1"
+    local tech_insert="$2"
+    local changes_start="$3"
+    local trim_end="$4"
+    local keep_changes="$5"
+    local change_entry="$6"
+    shift 6
+    local i
+
+    AGENT_FILE_OUT=()
+    local pos=0
+
+    # Sections are disjoint, so apply the edits in file order
+    local edits=()
+    [[ $tech_start -ge 0 && $# -gt 0 ]] && edits+=("$tech_insert:tech")
+    [[ $changes_start -ge 0 ]] && edits+=("$((changes_start + 1)):changes")
+    if [[ ${#edits[@]} -eq 2 && ${edits[0]%%:*} -gt ${edits[1]%%:*} ]]; then
+        edits=("${edits[1]}" "${edits[0]}")
+    fi
+
+    local edit at
+    for edit in "${edits[@]}"; do
+        at="${edit%%:*}"
+        AGENT_FILE_OUT+=("${AGENT_FILE_LINES[@]:pos:at-pos}")
+        pos=$at
+
+        if [[ "${edit#*:}" == "tech" ]]; then
+            AGENT_FILE_OUT+=("$@")
+        else
+            [[ -n "$change_entry" ]] && AGENT_FILE_OUT+=("$change_entry")
+
+            # Keep only the most recent existing changes; other lines pass through
+            local kept=0
+            for ((i=changes_start+1; i<trim_end; i++)); do
+                if [[ "${AGENT_FILE_LINES[i]}" == "- "* ]]; then
+                    [[ $kept -lt $keep_changes ]] || continue
+                    kept=$((kept + 1))
+                fi
+                AGENT_FILE_OUT+=("${AGENT_FILE_LINES[i]}")
+            done
+            pos=$trim_end
+        fi
+    done
+    AGENT_FILE_OUT+=("${AGENT_FILE_LINES[@]:pos}")
+
+    # Append sections that do not exist yet
+    if [[ $tech_start -lt 0 && $# -gt 0 ]]; then
+        AGENT_FILE_OUT+=("" "## Active Technologies" "$@")
+    fi
+    if [[ $changes_start -lt 0 && -n "$change_entry" ]]; then
+        AGENT_FILE_OUT+=("" "## Recent Changes" "$change_entry")
+    fi
+}
+
 update_existing_agent_file() {
     local target_file="$1"
     local current_date="$2"
     
     log_info "Updating existing agent context file..."
+    AGENT_FILE_CHANGED=false
     
-    # Use a single temporary file for atomic update
-    local temp_file
-    temp_file=$(mktemp) || {
-        log_error "Failed to create temporary file"
-        return 1
-    }
+    local content=""
+    IFS= read -r -d '' content < "$target_file" || true
+    AGENT_FILE_LINES=()
+    mapfile -t AGENT_FILE_LINES <<< "${content%$'\n'}"
+    [[ -z "$content" ]] && AGENT_FILE_LINES=()
     
-    # Process the file in one pass
-    local tech_stack=$(format_technology_stack "$NEW_LANG" "$NEW_FRAMEWORK")
+    local tech_stack="$NEW_TECH_STACK"
     local new_tech_entries=()
-    local new_change_entry=""
+    local new_change_entry="$NEW_CHANGE_ENTRY"
     
     # Prepare new technology entries
-    if [[ -n "$tech_stack" ]] && ! grep -q "$tech_stack" "$target_file"; then
+    if [[ -n "$tech_stack" ]] && [[ "$content" != *"$tech_stack"* ]]; then
         new_tech_entries+=("- $tech_stack ($CURRENT_BRANCH)")
     fi
     
-    if [[ -n "$NEW_DB" ]] && [[ "$NEW_DB" != "N/A" ]] && [[ "$NEW_DB" != "NEEDS CLARIFICATION" ]] && ! grep -q "$NEW_DB" "$target_file"; then
+    if [[ -n "$NEW_DB" ]] && [[ "$NEW_DB" != "N/A" ]] && [[ "$NEW_DB" != "NEEDS CLARIFICATION" ]] && [[ "$content" != *"$NEW_DB"* ]]; then
         new_tech_entries+=("- $NEW_DB ($CURRENT_BRANCH)")
     fi
     
-    # Prepare new change entry
-    if [[ -n "$tech_stack" ]]; then
-        new_change_entry="- $CURRENT_BRANCH: Added $tech_stack"
-    elif [[ -n "$NEW_DB" ]] && [[ "$NEW_DB" != "N/A" ]] && [[ "$NEW_DB" != "NEEDS CLARIFICATION" ]]; then
-        new_change_entry="- $CURRENT_BRANCH: Added $NEW_DB"
-    fi
-    
-    # Check if sections exist in the file
-    local has_active_technologies=0
-    local has_recent_changes=0
-    
-    if grep -q "^## Active Technologies" "$target_file" 2>/dev/null; then
-        has_active_technologies=1
-    fi
-    
-    if grep -q "^## Recent Changes" "$target_file" 2>/dev/null; then
-        has_recent_changes=1
-    fi
-    
-    # Process file line by line
-    local in_tech_section=false
-    local in_changes_section=false
-    local tech_entries_added=false
-    local changes_entries_added=false
-    local existing_changes_count=0
-    local file_ended=false
-    
-    while IFS= read -r line || [[ -n "$line" ]]; do
-        # Handle Active Technologies section
-        if [[ "$line" == "## Active Technologies" ]]; then
-            echo "$line" >> "$temp_file"
-            in_tech_section=true
-            continue
-        elif [[ $in_tech_section == true ]] && [[ "$line" =~ ^##[[:space:]] ]]; then
-            # Add new tech entries before closing the section
-            if [[ $tech_entries_added == false ]] && [[ ${#new_tech_entries[@]} -gt 0 ]]; then
-                printf '%s\n' "${new_tech_entries[@]}" >> "$temp_file"
-                tech_entries_added=true
-            fi
-            echo "$line" >> "$temp_file"
-            in_tech_section=false
-            continue
-        elif [[ $in_tech_section == true ]] && [[ -z "$line" ]]; then
-            # Add new tech entries before empty line in tech section
-            if [[ $tech_entries_added == false ]] && [[ ${#new_tech_entries[@]} -gt 0 ]]; then
-                printf '%s\n' "${new_tech_entries[@]}" >> "$temp_file"
-                tech_entries_added=true
+    # Locate section ranges and timestamp lines in a single pass
+    local tech_start=-1 tech_end=-1 tech_insert=-1
+    local changes_start=-1 changes_end=-1
+    local date_lines=()
+    local change_lines=()
+    local count=${#AGENT_FILE_LINES[@]}
+    local i line
+    local date_re='\*\*Last updated\*\*:.*[0-9]{4}-[0-9]{2}-[0-9]{2}'
+    
+    for ((i=0; i<count; i++)); do
+        line="${AGENT_FILE_LINES[i]}"
+        if [[ "$line" == "##"[[:space:]]* ]]; then
+            [[ $tech_start -ge 0 && $tech_end -lt 0 ]] && tech_end=$i
+            [[ $changes_start -ge 0 && $changes_end -lt 0 ]] && changes_end=$i
+            if [[ "$line" == "## Active Technologies" && $tech_start -lt 0 ]]; then
+                tech_start=$i
+            elif [[ "$line" == "## Recent Changes" && $changes_start -lt 0 ]]; then
+                changes_start=$i
             fi
-            echo "$line" >> "$temp_file"
-            continue
+        elif [[ -z "$line" ]]; then
+            # New technologies go before the first blank line of the section
+            [[ $tech_start -ge 0 && $tech_end -lt 0 && $tech_insert -lt 0 ]] && tech_insert=$i
+        elif [[ "$line" == *"**Last updated**"* && "$line" =~ $date_re ]]; then
+            date_lines+=("$i")
+        elif [[ "$line" == "- "* ]]; then
+            [[ $changes_start -ge 0 && $changes_end -lt 0 ]] && change_lines+=("$i")
         fi
-        
-        # Handle Recent Changes section
-        if [[ "$line" == "## Recent Changes" ]]; then
-            echo "$line" >> "$temp_file"
-            # Add new change entry right after the heading
-            if [[ -n "$new_change_entry" ]]; then
-                echo "$new_change_entry" >> "$temp_file"
-            fi
-            in_changes_section=true
-            changes_entries_added=true
-            continue
-        elif [[ $in_changes_section == true ]] && [[ "$line" =~ ^##[[:space:]] ]]; then
-            echo "$line" >> "$temp_file"
-            in_changes_section=false
-            continue
-        elif [[ $in_changes_section == true ]] && [[ "$line" == "- "* ]]; then
-            # Keep only first 2 existing changes
-            if [[ $existing_changes_count -lt 2 ]]; then
-                echo "$line" >> "$temp_file"
-                ((existing_changes_count++))
-            fi
-            continue
-        fi
-        
-        # Update timestamp
-        if [[ "$line" =~ \*\*Last\ updated\*\*:.*[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] ]]; then
-            echo "$line" | sed "s/[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]/$current_date/" >> "$temp_file"
-        else
-            echo "$line" >> "$temp_file"
-        fi
-    done < "$target_file"
-    
-    # Post-loop check: if we're still in the Active Technologies section and haven't added new entries
-    if [[ $in_tech_section == true ]] && [[ $tech_entries_added == false ]] && [[ ${#new_tech_entries[@]} -gt 0 ]]; then
-        printf '%s\n' "${new_tech_entries[@]}" >> "$temp_file"
-        tech_entries_added=true
-    fi
+    done
+    [[ $tech_start -ge 0 && $tech_end -lt 0 ]] && tech_end=$count
+    [[ $changes_start -ge 0 && $changes_end -lt 0 ]] && changes_end=$count
+    [[ $tech_insert -lt 0 ]] && tech_insert=$tech_end
+    
+    # Keep the Recent Changes list bounded: the new entry plus the last 2. An
+    # entry that is already at the top is not repeated, so re-runs are no-ops.
+    local change_entry="$new_change_entry"
+    local keep_changes=2
+    if [[ ${#change_lines[@]} -gt 0 && -n "$change_entry" && "${AGENT_FILE_LINES[change_lines[0]]}" == "$change_entry" ]]; then
+        change_entry=""
+        keep_changes=3
+    fi
+    
+    # Only the lines up to the last dropped entry need filtering
+    local trim_end=$((changes_start + 1))
+    if [[ ${#change_lines[@]} -gt $keep_changes ]]; then
+        trim_end=$((${change_lines[-1]} + 1))
+    fi
+    
+    # Skip the write entirely when the sections would not change, so file watchers
+    # and prompt caches are not invalidated by a timestamp-only rewrite. Nothing
+    # changes unless there is an entry to add or old changes to trim.
+    if [[ ${#new_tech_entries[@]} -eq 0 && -z "$change_entry" && ${#change_lines[@]} -le $keep_changes ]]; then
+        log_info "Agent context file already up to date; leaving it untouched"
+        return 0
+    fi
+    
+    # Refresh timestamps in place (only the few matching lines are touched)
+    local prefix
+    for i in "${date_lines[@]}"; do
+        prefix="${AGENT_FILE_LINES[i]%%[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*}"
+        AGENT_FILE_LINES[i]="$prefix$current_date${AGENT_FILE_LINES[i]:$((${#prefix} + 10))}"
+    done
     
-    # If sections don't exist, add them at the end of the file
-    if [[ $has_active_technologies -eq 0 ]] && [[ ${#new_tech_entries[@]} -gt 0 ]]; then
-        echo "" >> "$temp_file"
-        echo "## Active Technologies" >> "$temp_file"
-        printf '%s\n' "${new_tech_entries[@]}" >> "$temp_file"
-        tech_entries_added=true
-    fi
+    splice_agent_file "$tech_start" "$tech_insert" "$changes_start" "$trim_end" \
+        "$keep_changes" "$change_entry" "${new_tech_entries[@]}"
     
-    if [[ $has_recent_changes -eq 0 ]] && [[ -n "$new_change_entry" ]]; then
-        echo "" >> "$temp_file"
-        echo "## Recent Changes" >> "$temp_file"
-        echo "$new_change_entry" >> "$temp_file"
-        changes_entries_added=true
-    fi
+    # Use a temporary file next to the target so the final rename is atomic
+    local temp_file
+    make_agent_temp_file "$target_file" || {
+        log_error "Failed to create temporary file"
+        return 1
+    }
+    temp_file="$AGENT_TEMP_FILE"
     
-    # Move temp file to target atomically
-    if ! mv "$temp_file" "$target_file"; then
+    if ! printf '%s\n' "${AGENT_FILE_OUT[@]}" > "$temp_file" || ! trace_cmd mv "$temp_file" "$target_file"; then
         log_error "Failed to update target file"
         rm -f "$temp_file"
         return 1
     fi
     
+    AGENT_FILE_CHANGED=true
     return 0
 }
 #==============================================================================
@@ -516,15 +603,15 @@ update_agent_file() {
     log_info "Updating $agent_name context file: $target_file"
     
     local project_name
-    project_name=$(basename "$REPO_ROOT")
+    project_name=$(trace_cmd basename "$REPO_ROOT")
     local current_date
-    current_date=$(date +%Y-%m-%d)
+    current_date=$(trace_cmd date +%Y-%m-%d)
     
     # Create directory if it doesn't exist
     local target_dir
-    target_dir=$(dirname "$target_file")
+    target_dir=$(trace_cmd dirname "$target_file")
     if [[ ! -d "$target_dir" ]]; then
-        if ! mkdir -p "$target_dir"; then
+        if ! trace_cmd mkdir -p "$target_dir"; then
             log_error "Failed to create directory: $target_dir"
             return 1
         fi
@@ -533,13 +620,14 @@ update_agent_file() {
     if [[ ! -f "$target_file" ]]; then
         # Create new file from template
         local temp_file
-        temp_file=$(mktemp) || {
+        make_agent_temp_file "$target_file" || {
             log_error "Failed to create temporary file"
             return 1
         }
+        temp_file="$AGENT_TEMP_FILE"
         
-        if create_new_agent_file "$target_file" "$temp_file" "$project_name" "$current_date"; then
-            if mv "$temp_file" "$target_file"; then
+        if trace_call create_new_agent_file "$target_file" "$temp_file" "$project_name" "$current_date"; then
+            if trace_cmd mv "$temp_file" "$target_file"; then
                 log_success "Created new $agent_name context file"
             else
                 log_error "Failed to move temporary file to $target_file"
@@ -563,8 +651,12 @@ update_agent_file() {
             return 1
         fi
         
-        if update_existing_agent_file "$target_file" "$current_date"; then
-            log_success "Updated existing $agent_name context file"
+        if trace_call update_existing_agent_file "$target_file" "$current_date"; then
+            if [[ "$AGENT_FILE_CHANGED" == true ]]; then
+                log_success "Updated existing $agent_name context file"
+            else
+                log_success "$agent_name context file unchanged"
+            fi
         else
             log_error "Failed to update existing agent file"
             return 1
@@ -641,90 +733,132 @@ update_specific_agent() {
     esac
 }
 
-update_all_existing_agents() {
-    local found_agent=false
-    
-    # Check each possible agent file and update if it exists
-    if [[ -f "$CLAUDE_FILE" ]]; then
-        update_agent_file "$CLAUDE_FILE" "Claude Code"
-        found_agent=true
-    fi
-    
-    if [[ -f "$GEMINI_FILE" ]]; then
-        update_agent_file "$GEMINI_FILE" "Gemini CLI"
-        found_agent=true
-    fi
-    
-    if [[ -f "$COPILOT_FILE" ]]; then
-        update_agent_file "$COPILOT_FILE" "GitHub Copilot"
-        found_agent=true
-    fi
-    
-    if [[ -f "$CURSOR_FILE" ]]; then
-        update_agent_file "$CURSOR_FILE" "Cursor IDE"
-        found_agent=true
-    fi
-    
-    if [[ -f "$QWEN_FILE" ]]; then
-        update_agent_file "$QWEN_FILE" "Qwen Code"
-        found_agent=true
-    fi
-    
-    if [[ -f "$AGENTS_FILE" ]]; then
-        update_agent_file "$AGENTS_FILE" "Codex/opencode"
-        found_agent=true
-    fi
-    
-    if [[ -f "$WINDSURF_FILE" ]]; then
-        update_agent_file "$WINDSURF_FILE" "Windsurf"
-        found_agent=true
-    fi
-    
-    if [[ -f "$KILOCODE_FILE" ]]; then
-        update_agent_file "$KILOCODE_FILE" "Kilo Code"
-        found_agent=true
-    fi
+# Resolve symlinks and relative components so agents sharing a file group together
+resolve_agent_path() {
+    local path="$1"
+    local link
 
-    if [[ -f "$AUGGIE_FILE" ]]; then
-        update_agent_file "$AUGGIE_FILE" "Auggie CLI"
-        found_agent=true
-    fi
-    
-    if [[ -f "$ROO_FILE" ]]; then
-        update_agent_file "$ROO_FILE" "Roo Code"
-        found_agent=true
-    fi
+    while [[ -L "$path" ]]; do
+        link=$(trace_cmd readlink "$path")
+        if [[ "$link" == /* ]]; then
+            path="$link"
+        else
+            path="${path%/*}/$link"
+        fi
+    done
 
-    if [[ -f "$CODEBUDDY_FILE" ]]; then
-        update_agent_file "$CODEBUDDY_FILE" "CodeBuddy CLI"
-        found_agent=true
-    fi
+    local dir
+    trace_begin cmd "cd && pwd -P"
+    dir=$(CDPATH="" cd "${path%/*}" 2>/dev/null && pwd -P) || dir="${path%/*}"
+    trace_end
+    echo "$dir/${path##*/}"
+}
 
-    if [[ -f "$SHAI_FILE" ]]; then
-        update_agent_file "$SHAI_FILE" "SHAI"
-        found_agent=true
-    fi
+# Update each distinct target file once, in parallel, and report per-target timings
+update_agent_targets_parallel() {
+    local count=${#AGENT_TARGET_PATHS[@]}
+    local success=true
+    local i
 
-    if [[ -f "$QODER_FILE" ]]; then
-        update_agent_file "$QODER_FILE" "Qoder CLI"
-        found_agent=true
-    fi
+    AGENT_LOG_DIR=$(trace_cmd mktemp -d) || {
+        log_error "Failed to create temporary directory"
+        return 1
+    }
+
+    for ((i=0; i<count; i++)); do
+        (
+            local started finished rc=0
+            AGENT_TEMP_LIST="$AGENT_LOG_DIR/$i.tmp"
+            started=$(get_epoch_ms)
+            if ! trace_call update_agent_file "${AGENT_TARGET_PATHS[i]}" "${AGENT_TARGET_NAMES[i]}"; then
+                rc=1
+            fi
+            finished=$(get_epoch_ms)
+            echo "$rc $((finished - started))" > "$AGENT_LOG_DIR/$i.status"
+        ) > "$AGENT_LOG_DIR/$i.out" 2> "$AGENT_LOG_DIR/$i.err" &
+    done
+    trace_begin func wait-agents
+    wait
+    trace_end
+
+    # Replay output in a stable order so logs never interleave
+    for ((i=0; i<count; i++)); do
+        trace_cmd cat "$AGENT_LOG_DIR/$i.out"
+        trace_cmd cat "$AGENT_LOG_DIR/$i.err" >&2
+
+        local rc=1 elapsed="?"
+        if [[ -f "$AGENT_LOG_DIR/$i.status" ]]; then
+            read -r rc elapsed < "$AGENT_LOG_DIR/$i.status"
+        fi
+
+        if [[ "$rc" -eq 0 ]]; then
+            log_info "${AGENT_TARGET_NAMES[i]}: ${AGENT_TARGET_PATHS[i]} (${elapsed} ms)"
+        else
+            log_error "${AGENT_TARGET_NAMES[i]}: ${AGENT_TARGET_PATHS[i]} failed (${elapsed} ms)"
+            success=false
+        fi
+    done
+
+    trace_cmd rm -rf "$AGENT_LOG_DIR"
+    AGENT_LOG_DIR=""
+
+    [[ "$success" == true ]]
+}
+
+update_all_existing_agents() {
+    local candidates=(
+        "$CLAUDE_FILE|Claude Code"
+        "$GEMINI_FILE|Gemini CLI"
+        "$COPILOT_FILE|GitHub Copilot"
+        "$CURSOR_FILE|Cursor IDE"
+        "$QWEN_FILE|Qwen Code"
+        "$AGENTS_FILE|Codex/opencode"
+        "$WINDSURF_FILE|Windsurf"
+        "$KILOCODE_FILE|Kilo Code"
+        "$AUGGIE_FILE|Auggie CLI"
+        "$ROO_FILE|Roo Code"
+        "$CODEBUDDY_FILE|CodeBuddy CLI"
+        "$SHAI_FILE|SHAI"
+        "$QODER_FILE|Qoder CLI"
+        "$AMP_FILE|Amp"
+        "$Q_FILE|Amazon Q Developer CLI"
+        "$BOB_FILE|IBM Bob"
+    )
+    local entry file name resolved i found
+
+    AGENT_TARGET_PATHS=()
+    AGENT_TARGET_NAMES=()
+
+    # Group existing agent files by resolved path so shared files are written once
+    for entry in "${candidates[@]}"; do
+        file="${entry%%|*}"
+        name="${entry#*|}"
+        [[ -f "$file" ]] || continue
+
+        resolved=$(trace_call resolve_agent_path "$file")
+        found=false
+        for i in "${!AGENT_TARGET_PATHS[@]}"; do
+            if [[ "${AGENT_TARGET_PATHS[i]}" == "$resolved" ]]; then
+                [[ ", ${AGENT_TARGET_NAMES[i]}, " == *", $name, "* ]] || AGENT_TARGET_NAMES[i]="${AGENT_TARGET_NAMES[i]}, $name"
+                found=true
+                break
+            fi
+        done
+        if [[ "$found" == false ]]; then
+            AGENT_TARGET_PATHS+=("$resolved")
+            AGENT_TARGET_NAMES+=("$name")
+        fi
+    done
 
-    if [[ -f "$Q_FILE" ]]; then
-        update_agent_file "$Q_FILE" "Amazon Q Developer CLI"
-        found_agent=true
-    fi
-    
-    if [[ -f "$BOB_FILE" ]]; then
-        update_agent_file "$BOB_FILE" "IBM Bob"
-        found_agent=true
-    fi
-    
     # If no agent files exist, create a default Claude file
-    if [[ "$found_agent" == false ]]; then
+    if [[ ${#AGENT_TARGET_PATHS[@]} -eq 0 ]]; then
         log_info "No existing agent files found, creating default Claude file..."
-        update_agent_file "$CLAUDE_FILE" "Claude Code"
+        trace_call update_agent_file "$CLAUDE_FILE" "Claude Code"
+        return
     fi
+
+    log_info "Updating ${#AGENT_TARGET_PATHS[@]} distinct agent file(s) in parallel..."
+    update_agent_targets_parallel
 }
 print_summary() {
     echo
@@ -758,14 +892,19 @@ main() {
     log_info "=== Updating agent context files for feature $CURRENT_BRANCH ==="
     
     # Parse the plan file to extract project information
+    trace_begin phase parse-plan
     if ! parse_plan_data "$NEW_PLAN"; then
         log_error "Failed to parse plan data"
         exit 1
     fi
+
+    prepare_update_entries
+    trace_end
     
     # Process based on agent type argument
     local success=true
     
+    trace_begin phase update-agents
     if [[ -z "$AGENT_TYPE" ]]; then
         # No specific agent provided - update all existing agent files
         log_info "No agent specified, updating all existing agent files..."
@@ -775,10 +914,11 @@ main() {
     else
         # Specific agent provided - update only that agent
         log_info "Updating specific agent: $AGENT_TYPE"
-        if ! update_specific_agent "$AGENT_TYPE"; then
+        if ! trace_call update_specific_agent "$AGENT_TYPE"; then
             success=false
         fi
     fi
+    trace_end
     
     # Print summary
     print_summary